@@ -0,0 +1,76 @@
+import hashlib
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.authentication import TokenAuthentication
+
+
+class TokenCache:
+    key_prefix = 'auth-token:'
+    user_prefix = 'auth-user:'
+
+    def __init__(self, ttl, alias=None):
+        self.ttl = ttl
+        self.alias = alias
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return caches[self.alias] if self.alias else None
+
+    def token_key(self, key):
+        return self.key_prefix + hashlib.sha256(key.encode()).hexdigest()
+
+    def user_key(self, user_id):
+        return f'{self.user_prefix}{user_id}'
+
+    def get(self, key):
+        if self.cache is None:
+            return None
+        token = self.cache.get(self.token_key(key))
+        with self._lock:
+            if token is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return token
+
+    def set(self, key, token):
+        if self.cache is None:
+            return
+        self.cache.set_many({self.token_key(key): token,
+                             self.user_key(token.user_id): key}, self.ttl)
+
+    def delete(self, *keys):
+        if self.cache is None:
+            return
+        self.cache.delete_many([self.token_key(key) for key in keys])
+
+    def forget_user(self, user_id):
+        if self.cache is None:
+            return
+        key = self.cache.get(self.user_key(user_id))
+        if key is not None:
+            self.cache.delete_many([self.token_key(key),
+                                    self.user_key(user_id)])
+
+    def stats(self):
+        with self._lock:
+            return {'enabled': self.cache is not None,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_TTL, settings.TOKEN_CACHE_ALIAS)
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+
+    def authenticate_credentials(self, key):
+        token = token_cache.get(key)
+        if token is None:
+            _, token = super().authenticate_credentials(key)
+            token_cache.set(key, token)
+        return token.user, token
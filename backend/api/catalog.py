@@ -0,0 +1,60 @@
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+
+from api.compression import accepted_encoding, available_encodings, compress
+
+
+def version_key(name):
+    return f'catalog:{name}:version'
+
+
+def bump_catalog_version(name):
+    caches['shared'].set(version_key(name), uuid.uuid4().hex,
+                         settings.CATALOG_CACHE_TTL)
+
+
+def catalog_version(name):
+    shared = caches['shared']
+    version = shared.get(version_key(name))
+    if version is None:
+        version = uuid.uuid4().hex
+        if not shared.add(version_key(name), version,
+                          settings.CATALOG_CACHE_TTL):
+            version = shared.get(version_key(name), version)
+    return version
+
+
+def get_catalog(name, render):
+    key = f'catalog:{name}:{catalog_version(name)}'
+    entry = cache.get(key)
+    if entry is None:
+        body = render()
+        entry = {
+            'etag': 'W/"{}"'.format(hashlib.sha1(body).hexdigest()),
+            'identity': body,
+        }
+        for encoding in available_encodings():
+            entry[encoding] = compress(body, encoding)
+        cache.set(key, entry, settings.CATALOG_CACHE_TTL)
+    return entry
+
+
+def catalog_response(request, name, render):
+    entry = get_catalog(name, render)
+    if entry['etag'] in request.META.get('HTTP_IF_NONE_MATCH', ''):
+        response = HttpResponseNotModified()
+    else:
+        encoding = accepted_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', '')) or 'identity'
+        response = HttpResponse(entry[encoding],
+                                content_type='application/json')
+        if encoding != 'identity':
+            response['Content-Encoding'] = encoding
+    response['ETag'] = entry['etag']
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
@@ -0,0 +1,91 @@
+import datetime
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from recipe.models import Carts, ChangeLog, Favorites
+from users.models import Subscriptions
+
+LINK_KINDS = {Favorites: 'favorite', Carts: 'cart',
+              Subscriptions: 'subscription'}
+
+
+pending = threading.local()
+
+
+def record_changes(kind, action, ids, user=None):
+    entries = [ChangeLog(kind=kind, action=action, object_id=pk, user=user)
+               for pk in ids]
+    batch = getattr(pending, 'entries', None)
+    if batch is not None:
+        batch.extend(entries)
+        return entries
+    return ChangeLog.objects.bulk_create(entries)
+
+
+@contextmanager
+def batched_changes():
+    pending.entries = []
+    try:
+        yield
+        ChangeLog.objects.bulk_create(pending.entries)
+    finally:
+        pending.entries = None
+
+
+def record_links(model, action, ids, user):
+    return record_changes(LINK_KINDS[model], action, ids, user)
+
+
+def latest_seq():
+    return ChangeLog.objects.order_by('-seq').values_list(
+        'seq', flat=True).first() or 0
+
+
+def collect_changes(since, user):
+    first = ChangeLog.objects.order_by('seq').values_list(
+        'seq', flat=True).first()
+    if since is None or (first is not None and since < first - 1):
+        return {'reset': True, 'seq': latest_seq(), 'more': False,
+                'changes': {}}
+    visible = Q(user__isnull=True)
+    if user.is_authenticated:
+        visible |= Q(user=user)
+    settled = timezone.now() - datetime.timedelta(
+        seconds=settings.SYNC_SETTLE_SECONDS)
+    entries = list(ChangeLog.objects.filter(
+        visible, seq__gt=since, created__lte=settled
+    ).order_by('seq').values_list(
+        'seq', 'kind', 'action', 'object_id'
+    )[:settings.SYNC_MAX_CHANGES + 1])
+    more = len(entries) > settings.SYNC_MAX_CHANGES
+    entries = entries[:settings.SYNC_MAX_CHANGES]
+    latest = {}
+    for _, kind, action, object_id in entries:
+        latest[kind, object_id] = action
+    changes = {}
+    for (kind, object_id), action in latest.items():
+        changes.setdefault(kind, {}).setdefault(action, []).append(object_id)
+    return {'reset': False, 'seq': entries[-1][0] if entries else since,
+            'more': more, 'changes': changes}
+
+
+def superseded():
+    later = ChangeLog.objects.filter(kind=OuterRef('kind'),
+                                     object_id=OuterRef('object_id'),
+                                     seq__gt=OuterRef('seq'))
+    return (
+        ChangeLog.objects.filter(user__isnull=True).filter(
+            Exists(later.filter(user__isnull=True))),
+        ChangeLog.objects.filter(user__isnull=False).filter(
+            Exists(later.filter(user=OuterRef('user')))),
+    )
+
+
+def expired(days):
+    return ChangeLog.objects.filter(
+        created__lt=timezone.now() - datetime.timedelta(days=days),
+        seq__lt=latest_seq())
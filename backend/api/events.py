@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.db import close_old_connections
+from rest_framework.exceptions import AuthenticationFailed
+
+from api.authentication import CachedTokenAuthentication
+from recipe.models import ChangeLog
+from users.models import User
+
+logger = logging.getLogger(__name__)
+
+LINK_KINDS = ('favorite', 'cart', 'subscription')
+TICKET_SALT = 'api.events.ticket'
+
+
+class Subscriber:
+    def __init__(self, loop, size):
+        self.loop = loop
+        self.queue = asyncio.Queue(size)
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class EventBroker:
+    def __init__(self, queue_size, poll_interval):
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+        self._subscribers = {}
+        self._lock = threading.Lock()
+        self._poller = None
+
+    def subscribe(self, user_id):
+        subscriber = Subscriber(asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscriber)
+            if self._poller is None:
+                self._poller = threading.Thread(
+                    target=self.poll, name='events-poller', daemon=True)
+                self._poller.start()
+        return subscriber
+
+    def unsubscribe(self, user_id, subscriber):
+        with self._lock:
+            subscribers = self._subscribers.get(user_id, set())
+            subscribers.discard(subscriber)
+            if not subscribers:
+                self._subscribers.pop(user_id, None)
+
+    def publish(self, user_id, event):
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        for subscriber in subscribers:
+            subscriber.loop.call_soon_threadsafe(subscriber.put, event)
+
+    def poll(self):
+        last_seq = None
+        while True:
+            close_old_connections()
+            try:
+                if last_seq is None:
+                    last_seq = ChangeLog.objects.order_by('-seq').values_list(
+                        'seq', flat=True).first() or 0
+                with self._lock:
+                    users = list(self._subscribers)
+                for entry in changes_since(users, last_seq):
+                    last_seq = entry['seq']
+                    self.publish(entry.pop('user_id'), entry)
+            except Exception:
+                logger.exception('Ошибка чтения журнала изменений')
+            time.sleep(self.poll_interval)
+
+
+def changes_since(users, seq):
+    if not users:
+        return []
+    return list(ChangeLog.objects.filter(
+        user_id__in=users, kind__in=LINK_KINDS, seq__gt=seq
+    ).order_by('seq').values('seq', 'kind', 'action', 'object_id',
+                             'user_id')[:settings.EVENTS_QUEUE_SIZE])
+
+
+broker = EventBroker(settings.EVENTS_QUEUE_SIZE, settings.EVENTS_POLL_INTERVAL)
+
+
+def format_event(entry):
+    lines = []
+    if entry.get('seq'):
+        lines.append(f'id: {entry["seq"]}')
+    lines.append(f'event: {entry["kind"]}')
+    lines.append('data: ' + json.dumps({'action': entry['action'],
+                                        'id': entry['object_id']}))
+    return ('\n'.join(lines) + '\n\n').encode()
+
+
+def issue_ticket(user):
+    return signing.dumps(user.pk, salt=TICKET_SALT)
+
+
+def read_ticket(ticket):
+    try:
+        return signing.loads(ticket, salt=TICKET_SALT,
+                             max_age=settings.EVENTS_TICKET_TTL)
+    except signing.BadSignature:
+        return None
+
+
+def authenticate(key, ticket):
+    try:
+        if key:
+            return CachedTokenAuthentication().authenticate_credentials(
+                key)[0]
+        user_id = read_ticket(ticket)
+        return user_id and User.objects.filter(pk=user_id).first()
+    except AuthenticationFailed:
+        return None
+    finally:
+        close_old_connections()
+
+
+def replay(user_id, seq):
+    try:
+        return changes_since([user_id], seq)
+    finally:
+        close_old_connections()
+
+
+async def wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def send_json(send, status, data):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json')]})
+    await send({'type': 'http.response.body',
+                'body': json.dumps(data, ensure_ascii=False).encode()})
+
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            return await send({'type': 'lifespan.shutdown.complete'})
+
+
+async def events_application(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+    if scope['path'] != settings.EVENTS_PATH:
+        return await send_json(send, 404, {'detail': 'Страница не найдена.'})
+    headers = dict(scope['headers'])
+    params = parse_qs(scope.get('query_string', b'').decode())
+    key = headers.get(b'authorization', b'').decode().partition(' ')[2]
+    ticket = params.get('ticket', [''])[0]
+    user = (key or ticket) and await sync_to_async(authenticate)(key, ticket)
+    if not user or not user.is_active:
+        return await send_json(send, 401, {
+            'detail': 'Учетные данные не были предоставлены.'})
+    last_id = (headers.get(b'last-event-id', b'').decode()
+               or params.get('last_event_id', [''])[0])
+    subscriber = broker.subscribe(user.pk)
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200,
+                    'headers': [(b'content-type', b'text/event-stream'),
+                                (b'cache-control', b'no-cache'),
+                                (b'x-accel-buffering', b'no')]})
+        if last_id.isdigit():
+            for entry in await sync_to_async(replay)(user.pk, int(last_id)):
+                subscriber.put(entry)
+        while True:
+            event = asyncio.ensure_future(subscriber.queue.get())
+            done, _ = await asyncio.wait(
+                (event, disconnect), timeout=settings.EVENTS_HEARTBEAT,
+                return_when=asyncio.FIRST_COMPLETED)
+            if disconnect in done:
+                event.cancel()
+                return None
+            if event in done:
+                body = format_event(event.result())
+            else:
+                event.cancel()
+                body = b': ping\n\n'
+            if subscriber.overflowed:
+                subscriber.overflowed = False
+                body += b'event: reset\ndata: {}\n\n'
+            await send({'type': 'http.response.body', 'body': body,
+                        'more_body': True})
+    finally:
+        disconnect.cancel()
+        broker.unsubscribe(user.pk, subscriber)
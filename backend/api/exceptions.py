@@ -0,0 +1,7 @@
+from rest_framework.exceptions import APIException
+
+
+class TooManyFilterValues(APIException):
+    status_code = 422
+    default_detail = 'Слишком много значений в фильтре.'
+    default_code = 'too_many_filter_values'
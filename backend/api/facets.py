@@ -0,0 +1,47 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count, Q
+
+from api.catalog import catalog_version
+from recipe.models import Tag
+
+IGNORED_PARAMS = {'page', 'limit', 'fields', 'expand', 'facets',
+                  'ordering', 'tags'}
+USER_PARAMS = {'is_favorited', 'is_in_shopping_cart'}
+
+
+def links_catalog(user_id):
+    return f'links:{user_id}'
+
+
+def facets_key(params, user):
+    items = sorted((name, value) for name in params
+                   if name not in IGNORED_PARAMS
+                   for value in params.getlist(name))
+    versions = [catalog_version('recipes')]
+    if USER_PARAMS & set(params) and user.is_authenticated:
+        items.append(('user', user.pk))
+        versions.append(catalog_version(links_catalog(user.pk)))
+    digest = hashlib.sha1(
+        f'{urlencode(items)}|{"|".join(versions)}'.encode()).hexdigest()
+    return f'facets:tags:{digest}'
+
+
+def count_tags(queryset):
+    return list(Tag.objects.annotate(count=Count(
+        'recipes',
+        filter=Q(recipes__in=queryset.order_by().values('pk'))
+    )).values('id', 'slug', 'count'))
+
+
+def tag_facets(request, get_queryset):
+    key = facets_key(request.query_params, request.user)
+    shared = caches['shared']
+    counts = shared.get(key)
+    if counts is None:
+        counts = count_tags(get_queryset())
+        shared.set(key, counts, settings.CATALOG_CACHE_TTL)
+    return counts
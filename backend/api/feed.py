@@ -0,0 +1,67 @@
+import heapq
+import itertools
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import Count
+
+from recipe.models import Recipe
+from users.models import Subscriptions
+
+
+def feed_key(user_id):
+    return f'feed:{user_id}'
+
+
+def fan_out(recipe):
+    followers = list(Subscriptions.objects.filter(
+        author_id=recipe.author_id
+    ).values_list('user_id', flat=True)[:settings.FEED_FANOUT_LIMIT + 1])
+    if len(followers) > settings.FEED_FANOUT_LIMIT:
+        return
+    shared = caches['shared']
+    feeds = shared.get_many([feed_key(user_id) for user_id in followers])
+    shared.set_many(
+        {key: [recipe.pk] + feed[:settings.FEED_LENGTH - 1]
+         for key, feed in feeds.items()},
+        settings.FEED_TTL)
+
+
+def invalidate_feeds(user_ids):
+    caches['shared'].delete_many([feed_key(user_id) for user_id in user_ids])
+
+
+def recent_ids(authors, cursor, limit):
+    queryset = Recipe.objects.filter(author_id__in=authors)
+    if cursor is not None:
+        queryset = queryset.filter(pk__lt=cursor)
+    return list(queryset.order_by('-pk').values_list('pk', flat=True)[:limit])
+
+
+def get_feed(user, cursor, limit):
+    authors = Subscriptions.objects.filter(user=user).annotate(
+        followers=Count('author__follower')
+    ).values_list('author_id', 'followers')
+    pushed_authors, pulled_authors = set(), set()
+    for author_id, followers in authors:
+        if followers > settings.FEED_FANOUT_LIMIT:
+            pulled_authors.add(author_id)
+        else:
+            pushed_authors.add(author_id)
+    shared = caches['shared']
+    feed = shared.get(feed_key(user.pk))
+    if feed is None:
+        feed = recent_ids(pushed_authors, None, settings.FEED_LENGTH)
+        shared.set(feed_key(user.pk), feed, settings.FEED_TTL)
+    pushed = [pk for pk in feed if cursor is None or pk < cursor]
+    if len(pushed) <= limit and len(feed) >= settings.FEED_LENGTH:
+        tail = min(feed) if cursor is None else min(cursor, min(feed))
+        pushed += recent_ids(pushed_authors, tail, limit + 1)
+    pulled = recent_ids(pulled_authors, cursor, limit + 1)
+    ids = []
+    for pk, _ in itertools.groupby(heapq.merge(pushed, pulled,
+                                               reverse=True)):
+        ids.append(pk)
+        if len(ids) > limit:
+            break
+    return ids[:limit], ids[limit - 1] if len(ids) > limit else None
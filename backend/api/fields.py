@@ -0,0 +1,16 @@
+from rest_framework.fields import ImageField
+
+
+class Base64ImageField(ImageField):
+    """Загружает drf_extra_fields и Pillow только при первой записи."""
+
+    _decoder_class = None
+
+    def to_internal_value(self, data):
+        return self.get_decoder().to_internal_value(data)
+
+    def get_decoder(self):
+        if Base64ImageField._decoder_class is None:
+            from drf_extra_fields.fields import Base64ImageField as decoder
+            Base64ImageField._decoder_class = decoder
+        return self._decoder_class(*self._args, **self._kwargs)
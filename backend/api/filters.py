@@ -1,8 +1,16 @@
+from django.conf import settings
+from django.db.models import Case, F, IntegerField, When
 from django_filters.rest_framework import (AllValuesMultipleFilter,
                                            BooleanFilter, CharFilter,
+                                           ChoiceFilter,
                                            FilterSet, NumberFilter)
+from rest_framework.exceptions import ValidationError
 
+from api.exceptions import TooManyFilterValues
+from api.guards import count
+from api.pantry import pantry_index
 from recipe.models import Ingredient, Recipe
+from recipe.search import search_recipes
 
 
 class IngredientFilter(FilterSet):
@@ -29,6 +37,20 @@ class RecipeFilter(FilterSet):
     tags = AllValuesMultipleFilter(
         field_name='tags__slug',
     )
+    search = CharFilter(
+        method='filter_search',
+    )
+    have = CharFilter(
+        method='filter_have',
+    )
+    max_missing = NumberFilter(
+        method='filter_max_missing',
+        min_value=0,
+    )
+    ordering = ChoiceFilter(
+        choices=(('popular', 'popularity'), ('trending', 'trending')),
+        method='filter_ordering',
+    )
 
     class Meta:
         model = Recipe
@@ -36,9 +58,34 @@ class RecipeFilter(FilterSet):
             'is_favorited',
             'is_in_shopping_cart',
             'author',
-            'tags'
+            'tags',
+            'search',
+            'have',
+            'max_missing',
+            'ordering'
         )
 
+    def is_valid(self):
+        for name in ('tags', 'have'):
+            values = self.data.getlist(name) if name in self.data else []
+            total = sum(len(value.split(',')) for value in values)
+            if total > settings.MAX_FILTER_VALUES:
+                count('rejected', name)
+                raise TooManyFilterValues(
+                    {name: f'Не более {settings.MAX_FILTER_VALUES} '
+                           'значений.'})
+        return super().is_valid()
+
+    def filter_queryset(self, queryset):
+        self.orderings = {}
+        queryset = super().filter_queryset(queryset)
+        ordering = [self.orderings[name]
+                    for name in ('search', 'ordering', 'have')
+                    if name in self.orderings]
+        if ordering:
+            queryset = queryset.order_by(*ordering, '-id')
+        return queryset
+
     def get_is_favorited(self, queryset, name, value):
         if not value:
             return queryset
@@ -48,3 +95,31 @@ class RecipeFilter(FilterSet):
         if not value:
             return queryset
         return queryset.filter(shopping_cart__user=self.request.user)
+
+    def filter_search(self, queryset, name, value):
+        self.orderings[name] = F('search_rank').desc()
+        return search_recipes(queryset, value)
+
+    def filter_have(self, queryset, name, value):
+        try:
+            have = [int(pk) for pk in value.split(',') if pk.strip()]
+        except ValueError:
+            raise ValidationError(
+                {name: 'Ожидается список ID ингредиентов через запятую.'})
+        max_missing = self.form.cleaned_data.get('max_missing')
+        if max_missing is None:
+            max_missing = settings.PANTRY_MAX_MISSING
+        ids = pantry_index.search(have, int(max_missing),
+                                  settings.PANTRY_MAX_RESULTS)
+        self.orderings[name] = Case(
+            *(When(pk=pk, then=position) for position, pk in enumerate(ids)),
+            output_field=IntegerField())
+        return queryset.filter(pk__in=ids)
+
+    def filter_max_missing(self, queryset, name, value):
+        return queryset
+
+    def filter_ordering(self, queryset, name, value):
+        self.orderings[name] = F(
+            'popularity' if value == 'popular' else 'trending').desc()
+        return queryset
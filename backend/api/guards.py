@@ -0,0 +1,64 @@
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.db import DatabaseError
+
+logger = logging.getLogger(__name__)
+
+metrics = Counter()
+metrics_lock = threading.Lock()
+
+
+def count(event, route):
+    with metrics_lock:
+        metrics[f'{event}:{route}'] += 1
+
+
+def snapshot():
+    with metrics_lock:
+        return dict(metrics)
+
+
+def is_timeout(exc):
+    if not isinstance(exc, DatabaseError):
+        return False
+    return (getattr(exc.__cause__, 'pgcode', None) == '57014'
+            or str(exc) == 'interrupted')
+
+
+class StatementTimeout:
+    def __init__(self, connection, timeout):
+        self.connection = connection
+        self.timeout = timeout
+        self.deadline = None
+        self.applied = False
+
+    def __call__(self, execute, sql, params, many, context):
+        if not self.applied:
+            self.applied = True
+            if self.connection.vendor == 'postgresql':
+                with self.connection.connection.cursor() as cursor:
+                    cursor.execute(
+                        'SET statement_timeout = %s', [self.timeout])
+            elif self.connection.vendor == 'sqlite':
+                self.connection.connection.set_progress_handler(
+                    self.expired, 1000)
+        self.deadline = time.monotonic() + self.timeout / 1000
+        return execute(sql, params, many, context)
+
+    def expired(self):
+        return time.monotonic() > self.deadline
+
+    def reset(self):
+        if not self.applied or self.connection.connection is None:
+            return
+        try:
+            if self.connection.vendor == 'postgresql':
+                with self.connection.connection.cursor() as cursor:
+                    cursor.execute('RESET statement_timeout')
+            elif self.connection.vendor == 'sqlite':
+                self.connection.connection.set_progress_handler(None, 0)
+        except Exception:
+            logger.warning('Не удалось сбросить statement_timeout')
@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.recommendations import save_index
+
+
+class Command(BaseCommand):
+    help = 'Строит индекс похожих рецептов по избранному и ингредиентам'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int,
+                            default=settings.RECOMMENDATIONS_TOP_K)
+        parser.add_argument('--ingredient-weight', type=float,
+                            default=settings.RECOMMENDATIONS_INGREDIENT_WEIGHT)
+        parser.add_argument('--output', default=settings.RECOMMENDATIONS_INDEX)
+
+    def handle(self, *args, **options):
+        total = save_index(options['output'],
+                           top_k=options['top_k'],
+                           ingredient_weight=options['ingredient_weight'])
+        self.stdout.write(f'Индекс построен для {total} рецептов: '
+                          f'{options["output"]}')
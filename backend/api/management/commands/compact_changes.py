@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.changes import expired, superseded
+from api.purge import delete_in_batches
+
+
+class Command(BaseCommand):
+    help = ('Сжимает журнал изменений: удаляет перекрытые более '
+            'поздними записи и записи старше срока хранения')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            default=settings.SYNC_RETENTION_DAYS)
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        collapsed = sum(delete_in_batches(queryset, options['batch_size'])
+                        for queryset in superseded())
+        removed = delete_in_batches(expired(options['days']),
+                                    options['batch_size'])
+        self.stdout.write(f'Удалено перекрытых записей: {collapsed}, '
+                          f'устаревших: {removed}')
@@ -0,0 +1,75 @@
+import json
+import os
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+
+from recipe.models import Recipe
+
+
+def copy_image(task):
+    source, target = task
+    try:
+        shutil.copyfile(source, target)
+    except OSError:
+        return None
+    return os.path.basename(target)
+
+
+def recipe_record(recipe, image):
+    return {
+        'author': {
+            'email': recipe.author.email,
+            'username': recipe.author.username,
+            'first_name': recipe.author.first_name,
+            'last_name': recipe.author.last_name,
+        },
+        'name': recipe.name,
+        'text': recipe.text,
+        'cooking_time': recipe.cooking_time,
+        'image': image,
+        'tags': [{'name': tag.name, 'slug': tag.slug, 'color': tag.color}
+                 for tag in recipe.tags.all()],
+        'ingredients': [{'name': row.name,
+                         'measurement_unit': row.measurement_unit,
+                         'amount': row.amount}
+                        for row in recipe.ingredient_recipe.all()],
+    }
+
+
+class Command(BaseCommand):
+    help = 'Выгружает рецепты в JSON Lines, изображения - в соседнюю папку'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str)
+        parser.add_argument('--images-dir', type=str, default=None)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+
+    def handle(self, *args, **options):
+        images_dir = options['images_dir'] or f'{options["path"]}.images'
+        os.makedirs(images_dir, exist_ok=True)
+        queryset = Recipe.objects.select_related('author').prefetch_related(
+            'tags', 'ingredient_recipe').order_by('pk')
+        last_pk = 0
+        total = 0
+        with open(options['path'], 'w', encoding='utf-8') as output, \
+                ProcessPoolExecutor(options['workers']) as pool:
+            while True:
+                recipes = list(queryset.filter(pk__gt=last_pk)[
+                    :options['batch_size']])
+                if not recipes:
+                    break
+                images = pool.map(copy_image, [
+                    (recipe.image.path,
+                     os.path.join(images_dir,
+                                  os.path.basename(recipe.image.name)))
+                    for recipe in recipes
+                ])
+                for recipe, image in zip(recipes, images):
+                    output.write(json.dumps(recipe_record(recipe, image),
+                                            ensure_ascii=False) + '\n')
+                last_pk = recipes[-1].pk
+                total += len(recipes)
+                self.stdout.write(f'Выгружено рецептов: {total}')
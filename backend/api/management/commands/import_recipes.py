@@ -0,0 +1,176 @@
+import itertools
+import json
+import os
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from api.catalog import bump_catalog_version
+from api.changes import record_changes
+from api.pantry import pantry_index
+from api.purge import delete_images
+from recipe.models import (ChangeLog, Ingredient, IngredientAmount, Recipe,
+                           Tag)
+from users.models import User
+
+UPLOAD_TO = 'recipe_images'
+
+
+def store_image(source):
+    from PIL import Image
+
+    try:
+        with Image.open(source) as image:
+            extension = image.format.lower()
+            image.verify()
+    except (OSError, SyntaxError):
+        return None
+    name = f'{UPLOAD_TO}/{uuid.uuid4()}.{extension}'
+    shutil.copyfile(source, os.path.join(settings.MEDIA_ROOT, name))
+    return name
+
+
+class Command(BaseCommand):
+    help = 'Загружает рецепты из JSON Lines пакетами с контрольными точками'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', type=str)
+        parser.add_argument('--images-dir', type=str, default=None)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--checkpoint', type=str, default=None)
+        parser.add_argument('--resume', action='store_true')
+
+    def handle(self, *args, **options):
+        self.images_dir = (options['images_dir']
+                           or f'{options["path"]}.images')
+        checkpoint = options['checkpoint'] or f'{options["path"]}.checkpoint'
+        done = 0
+        if options['resume'] and os.path.exists(checkpoint):
+            with open(checkpoint, encoding='utf-8') as file:
+                done = json.load(file)['line']
+        os.makedirs(os.path.join(settings.MEDIA_ROOT, UPLOAD_TO),
+                    exist_ok=True)
+        try:
+            source = open(options['path'], encoding='utf-8')
+        except FileNotFoundError:
+            raise CommandError(f'Файл {options["path"]} не найден')
+        imported = 0
+        with source, ProcessPoolExecutor(options['workers']) as pool:
+            lines = itertools.islice(source, done, None)
+            while True:
+                batch = [json.loads(line) for line in
+                         itertools.islice(lines, options['batch_size'])]
+                if not batch:
+                    break
+                imported += self.import_batch(batch, pool)
+                done += len(batch)
+                with open(checkpoint, 'w', encoding='utf-8') as file:
+                    json.dump({'line': done}, file)
+                self.stdout.write(f'Обработано строк: {done}, '
+                                  f'добавлено рецептов: {imported}')
+        pantry_index.invalidate()
+        bump_catalog_version('tags')
+        bump_catalog_version('ingredients')
+        bump_catalog_version('recipes')
+
+    def get_authors(self, records):
+        authors = {record['author']['email']: record['author']
+                   for record in records}
+        password = make_password(None)
+        User.objects.bulk_create(
+            [User(password=password, **author)
+             for author in authors.values()],
+            ignore_conflicts=True)
+        return dict(User.objects.filter(email__in=authors).values_list(
+            'email', 'pk'))
+
+    def get_tags(self, records):
+        tags = {tag['slug']: tag
+                for record in records for tag in record['tags']}
+        Tag.objects.bulk_create([Tag(**tag) for tag in tags.values()],
+                                ignore_conflicts=True)
+        return dict(Tag.objects.filter(slug__in=tags).values_list(
+            'slug', 'pk'))
+
+    def get_ingredients(self, records):
+        ingredients = {
+            (row['name'], row['measurement_unit'])
+            for record in records for row in record['ingredients']}
+        Ingredient.objects.bulk_create(
+            [Ingredient(name=name, measurement_unit=unit).normalize()
+             for name, unit in ingredients],
+            ignore_conflicts=True)
+        return {
+            (ingredient.name, ingredient.measurement_unit): ingredient
+            for ingredient in Ingredient.objects.filter(
+                name__in={name for name, _ in ingredients})}
+
+    def import_batch(self, records, pool):
+        authors = self.get_authors(records)
+        existing = set(Recipe.objects.filter(
+            author_id__in=authors.values(),
+            name__in={record['name'] for record in records},
+        ).values_list('author_id', 'name'))
+        unique = {}
+        for record in records:
+            key = authors[record['author']['email']], record['name']
+            if key not in existing and record.get('image'):
+                unique.setdefault(key, record)
+        images = pool.map(
+            store_image,
+            [os.path.join(self.images_dir, record['image'])
+             for record in unique.values()],
+            chunksize=16)
+        records = [(key, record, image)
+                   for (key, record), image in zip(unique.items(), images)
+                   if image]
+        tags = self.get_tags(record for _, record, _ in records)
+        ingredients = self.get_ingredients(
+            record for _, record, _ in records)
+        try:
+            with transaction.atomic():
+                Recipe.objects.bulk_create(
+                    [Recipe(author_id=key[0],
+                            name=record['name'],
+                            text=record['text'],
+                            cooking_time=record['cooking_time'],
+                            image=image)
+                     for key, record, image in records],
+                    ignore_conflicts=True)
+                stored = {
+                    (author, name): (pk, image) for pk, author, name, image
+                    in Recipe.objects.filter(
+                        author_id__in=authors.values(),
+                        name__in={record['name'] for _, record, _ in records},
+                    ).values_list('pk', 'author_id', 'name', 'image')}
+                inserted = [(stored[key][0], record)
+                            for key, record, image in records
+                            if stored[key][1] == image]
+                Recipe.tags.through.objects.bulk_create(
+                    [Recipe.tags.through(recipe_id=pk,
+                                         tag_id=tags[tag['slug']])
+                     for pk, record in inserted for tag in record['tags']],
+                    ignore_conflicts=True)
+                IngredientAmount.objects.bulk_create(
+                    [IngredientAmount(
+                        recipe_id=pk,
+                        ingredients=ingredients[
+                            row['name'], row['measurement_unit']],
+                        amount=row['amount']).copy_ingredient()
+                     for pk, record in inserted
+                     for row in record['ingredients']],
+                    ignore_conflicts=True)
+                record_changes('recipe', ChangeLog.UPSERT,
+                               [pk for pk, _ in inserted])
+        except Exception:
+            delete_images([image for _, _, image in records])
+            raise
+        delete_images([image for key, _, image in records
+                       if stored[key][1] != image])
+        return len(inserted)
@@ -0,0 +1,120 @@
+import random
+import threading
+import time
+from collections import defaultdict
+
+import numpy as np
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.authtoken.models import Token
+
+from api.management.commands.seed_load import SEED_EMAIL
+from recipe.models import Ingredient, Recipe, Tag
+from users.models import User
+
+DEFAULT_MIX = 'browse=45,filter=15,search=10,toggle=25,download=5'
+
+
+class Scenario:
+    def __init__(self, base_url, tokens, recipes, tags, words):
+        self.base_url = base_url.rstrip('/')
+        self.tokens = tokens
+        self.recipes = recipes
+        self.tags = tags
+        self.words = words
+
+    def browse(self, session):
+        return [session.get(f'{self.base_url}/api/recipes/',
+                            params={'page': random.randint(1, 20)})]
+
+    def filter(self, session):
+        params = {'tags': random.sample(self.tags,
+                                        random.randint(1, len(self.tags)))}
+        params[random.choice(('is_favorited', 'is_in_shopping_cart',
+                              'limit'))] = 1
+        return [session.get(f'{self.base_url}/api/recipes/', params=params)]
+
+    def search(self, session):
+        return [session.get(f'{self.base_url}/api/recipes/',
+                            params={'search': random.choice(self.words)})]
+
+    def toggle(self, session):
+        url = (f'{self.base_url}/api/recipes/{random.choice(self.recipes)}/'
+               f'{random.choice(("favorite", "shopping_cart"))}/')
+        return [session.post(url), session.delete(url)]
+
+    def download(self, session):
+        return [session.get(
+            f'{self.base_url}/api/recipes/download_shopping_cart/')]
+
+
+class Command(BaseCommand):
+    help = 'Воспроизводит смешанную нагрузку на API и считает перцентили'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--base-url', default='http://localhost:8000')
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--duration', type=float, default=30)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--mix', default=DEFAULT_MIX)
+
+    def handle(self, *args, **options):
+        mix = dict(
+            (name, float(weight)) for name, weight in
+            (item.split('=') for item in options['mix'].split(',')))
+        users = User.objects.filter(
+            email__startswith=SEED_EMAIL.split('{')[0])[:options['users']]
+        tokens = [Token.objects.get_or_create(user=user)[0].key
+                  for user in users]
+        if not tokens:
+            raise CommandError('Нет пользователей, запустите seed_load')
+        scenario = Scenario(
+            options['base_url'], tokens,
+            list(Recipe.objects.values_list('pk', flat=True)[:10000]),
+            list(Tag.objects.values_list('slug', flat=True)),
+            [name.split()[0] for name in
+             Ingredient.objects.values_list('name', flat=True)[:500]])
+        operations = [getattr(scenario, name) for name in mix]
+        latencies = defaultdict(list)
+        errors = defaultdict(int)
+        lock = threading.Lock()
+        deadline = time.monotonic() + options['duration']
+
+        def worker(token):
+            session = requests.Session()
+            session.headers['Authorization'] = f'Token {token}'
+            while time.monotonic() < deadline:
+                operation = random.choices(operations,
+                                           weights=list(mix.values()))[0]
+                started = time.perf_counter()
+                try:
+                    responses = operation(session)
+                    failed = any(response.status_code >= 500
+                                 for response in responses)
+                except requests.RequestException:
+                    failed = True
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies[operation.__name__].append(elapsed)
+                    errors[operation.__name__] += failed
+
+        threads = [
+            threading.Thread(target=worker,
+                             args=(tokens[number % len(tokens)],))
+            for number in range(options['concurrency'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.report(latencies, errors, options['duration'])
+
+    def report(self, latencies, errors, duration):
+        self.stdout.write(f'{"операция":<10} {"запросов":>9} {"ошибок":>7} '
+                          f'{"rps":>8} {"p50":>8} {"p90":>8} {"p99":>8} '
+                          f'{"max":>8}')
+        for name, values in sorted(latencies.items()):
+            p50, p90, p99 = np.percentile(values, (50, 90, 99)) * 1000
+            self.stdout.write(
+                f'{name:<10} {len(values):>9} {errors[name]:>7} '
+                f'{len(values) / duration:>8.1f} {p50:>8.1f} {p90:>8.1f} '
+                f'{p99:>8.1f} {max(values) * 1000:>8.1f}')
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from recipe.models import Ingredient, IngredientAmount
+from recipe.units import normalize_ingredients
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает нормализованные названия, базовые единицы '
+            'и множители ингредиентов и их копии в рецептах')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        changed = normalize_ingredients(
+            Ingredient, IngredientAmount, options['batch_size'])
+        self.stdout.write(f'Обновлено ингредиентов: {changed}')
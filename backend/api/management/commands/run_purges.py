@@ -0,0 +1,29 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.purge import run_queued
+
+
+class Command(BaseCommand):
+    help = ('Выполняет удаления рецептов и пользователей, поставленные '
+            'в очередь из админки')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Не завершаться, а опрашивать очередь')
+        parser.add_argument('--interval', type=float,
+                            default=settings.PURGE_POLL_INTERVAL)
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            done = run_queued(batch_size=options['batch_size'])
+            if done:
+                self.stdout.write(f'Выполнено удалений: {done}')
+            elif not options['loop']:
+                return
+            else:
+                time.sleep(options['interval'])
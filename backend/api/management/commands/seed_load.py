@@ -0,0 +1,163 @@
+import csv
+import os
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+
+from api.catalog import bump_catalog_version
+from api.pantry import pantry_index
+from recipe.models import (Carts, Favorites, Ingredient, IngredientAmount,
+                           Recipe, Tag)
+from users.models import Subscriptions, User
+
+SEED_EMAIL = 'seed{}@foodgram.local'
+SEED_IMAGE = 'recipe_images/seed.png'
+
+
+def zipf_weights(size, exponent, rng):
+    weights = 1 / np.arange(1, size + 1) ** exponent
+    rng.shuffle(weights)
+    return weights / weights.sum()
+
+
+def unique_pairs(left, right):
+    pairs = np.unique(np.stack([left, right], axis=1), axis=0)
+    return pairs[pairs[:, 0] != pairs[:, 1]]
+
+
+class Command(BaseCommand):
+    help = 'Генерирует реалистичный набор данных для нагрузочных тестов'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--recipes', type=int, default=5000)
+        parser.add_argument('--follows', type=float, default=10,
+                            help='Среднее число подписок пользователя')
+        parser.add_argument('--favorites', type=float, default=20,
+                            help='Среднее число избранных рецептов')
+        parser.add_argument('--cart', type=float, default=5,
+                            help='Среднее число рецептов в корзине')
+        parser.add_argument('--ingredients', type=float, default=8,
+                            help='Среднее число ингредиентов в рецепте')
+        parser.add_argument('--exponent', type=float, default=1.2,
+                            help='Показатель степенного распределения')
+        parser.add_argument('--password', default='seed-password')
+        parser.add_argument('--seed', type=int, default=None)
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        self.rng = np.random.default_rng(options['seed'])
+        self.batch_size = options['batch_size']
+        ingredients = self.load_catalogs()
+        users = self.create_users(options['users'], options['password'])
+        popularity = zipf_weights(len(users), options['exponent'], self.rng)
+        self.create_subscriptions(users, popularity, options['follows'])
+        recipes = self.create_recipes(users, popularity, ingredients,
+                                      options['recipes'],
+                                      options['ingredients'])
+        recipe_popularity = zipf_weights(len(recipes), options['exponent'],
+                                         self.rng)
+        for model, mean in ((Favorites, options['favorites']),
+                            (Carts, options['cart'])):
+            self.create_links(model, users, recipes, recipe_popularity, mean)
+        pantry_index.invalidate()
+        bump_catalog_version('tags')
+        bump_catalog_version('ingredients')
+        bump_catalog_version('recipes')
+
+    def load_catalogs(self):
+        data = os.path.join(settings.BASE_DIR, 'data')
+        with open(os.path.join(data, 'ingredients.csv'),
+                  encoding='utf-8') as file:
+            Ingredient.objects.bulk_create(
+                [Ingredient(name=name, measurement_unit=unit).normalize()
+                 for name, unit in csv.reader(file)],
+                ignore_conflicts=True)
+        with open(os.path.join(data, 'tags.csv'), encoding='utf-8') as file:
+            Tag.objects.bulk_create(
+                [Tag(name=name, slug=slug, color=color)
+                 for name, slug, color in csv.reader(file)],
+                ignore_conflicts=True)
+        return list(Ingredient.objects.all())
+
+    def create_users(self, count, password):
+        password = make_password(password)
+        emails = [SEED_EMAIL.format(number) for number in range(count)]
+        User.objects.bulk_create(
+            [User(email=email, username=email.split('@')[0],
+                  first_name='Повар', last_name=str(number),
+                  password=password)
+             for number, email in enumerate(emails)],
+            batch_size=self.batch_size, ignore_conflicts=True)
+        users = np.array(User.objects.filter(email__in=emails).order_by(
+            'pk').values_list('pk', flat=True))
+        self.stdout.write(f'Пользователей: {len(users)}')
+        return users
+
+    def create_subscriptions(self, users, popularity, mean):
+        follows = self.rng.poisson(mean, len(users))
+        pairs = unique_pairs(
+            np.repeat(users, follows),
+            self.rng.choice(users, follows.sum(), p=popularity))
+        Subscriptions.objects.bulk_create(
+            (Subscriptions(user_id=user, author_id=author)
+             for user, author in pairs.tolist()),
+            batch_size=self.batch_size, ignore_conflicts=True)
+        self.stdout.write(f'Подписок: {len(pairs)}')
+
+    def create_recipes(self, users, popularity, ingredients, count, mean):
+        authors = self.rng.choice(users, count, p=popularity)
+        last_pk = Recipe.objects.order_by('-pk').values_list(
+            'pk', flat=True).first() or 0
+        Recipe.objects.bulk_create(
+            (Recipe(author_id=author, name=f'Рецепт {last_pk + number}',
+                    text='Смешать ингредиенты и готовить до готовности.',
+                    cooking_time=int(self.rng.integers(5, 180)),
+                    image=SEED_IMAGE)
+             for number, author in enumerate(authors.tolist())),
+            batch_size=self.batch_size, ignore_conflicts=True)
+        self.create_image()
+        recipes = np.array(Recipe.objects.filter(
+            pk__gt=last_pk).order_by('pk').values_list('pk', flat=True))
+        sizes = np.clip(self.rng.normal(mean, mean / 3, len(recipes)),
+                        1, len(ingredients)).astype(int)
+        IngredientAmount.objects.bulk_create(
+            (IngredientAmount(recipe_id=recipe,
+                              ingredients=ingredients[index],
+                              amount=int(self.rng.integers(1, 500)))
+             .copy_ingredient()
+             for recipe, size in zip(recipes.tolist(), sizes.tolist())
+             for index in self.rng.choice(len(ingredients), size,
+                                          replace=False).tolist()),
+            batch_size=self.batch_size, ignore_conflicts=True)
+        tags = list(Tag.objects.values_list('pk', flat=True))
+        Recipe.tags.through.objects.bulk_create(
+            (Recipe.tags.through(recipe_id=recipe, tag_id=tag)
+             for recipe in recipes.tolist()
+             for tag in self.rng.choice(
+                 tags, self.rng.integers(1, len(tags) + 1), replace=False)),
+            batch_size=self.batch_size, ignore_conflicts=True)
+        self.stdout.write(f'Рецептов: {len(recipes)}')
+        return recipes
+
+    def create_image(self):
+        from PIL import Image
+
+        path = os.path.join(settings.MEDIA_ROOT, SEED_IMAGE)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            Image.new('RGB', (480, 320), '#f79f00').save(path)
+
+    def create_links(self, model, users, recipes, popularity, mean):
+        counts = self.rng.poisson(mean, len(users))
+        pairs = np.unique(np.stack([
+            np.repeat(users, counts),
+            self.rng.choice(recipes, counts.sum(), p=popularity),
+        ], axis=1), axis=0)
+        model.objects.bulk_create(
+            (model(user_id=user, recipe_id=recipe)
+             for user, recipe in pairs.tolist()),
+            batch_size=self.batch_size, ignore_conflicts=True)
+        self.stdout.write(f'{model._meta.verbose_name_plural}: {len(pairs)}')
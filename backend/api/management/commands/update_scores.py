@@ -0,0 +1,18 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.popularity import update_scores
+
+
+class Command(BaseCommand):
+    help = ('Пересчитывает популярность рецептов по избранному '
+            'и спискам покупок с затуханием по времени')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int,
+                            default=settings.POPULARITY_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        total, changed = update_scores(options['batch_size'])
+        self.stdout.write(f'Пересчитано {total} рецептов, '
+                          f'обновлено {changed}')
@@ -0,0 +1,83 @@
+import asyncio
+import re
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from api.compression import accepted_encoding, compress
+from api.guards import StatementTimeout, count, is_timeout
+
+
+class CompressionMiddleware(MiddlewareMixin):
+
+    def process_response(self, request, response):
+        if (response.streaming
+                or response.has_header('Content-Encoding')
+                or len(response.content) < settings.COMPRESSION_MIN_SIZE):
+            return response
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = accepted_encoding(
+            request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+        compressed = compress(response.content, encoding)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+        if response.has_header('ETag'):
+            response['ETag'] = re.sub(r'^"', 'W/"', response['ETag'])
+        return response
+
+
+class StatementTimeoutMiddleware(MiddlewareMixin):
+
+    def __call__(self, request):
+        if asyncio.iscoroutinefunction(self.get_response):
+            return self.acall(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self.remove_guard(request)
+
+    async def acall(self, request):
+        try:
+            return await self.get_response(request)
+        finally:
+            await sync_to_async(self.remove_guard)(request)
+
+    def remove_guard(self, request):
+        guard = getattr(request, 'statement_timeout', None)
+        if guard is None:
+            return
+        del request.statement_timeout
+        if guard in guard.connection.execute_wrappers:
+            guard.connection.execute_wrappers.remove(guard)
+        guard.reset()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        if match.namespace != 'api':
+            return None
+        timeout = settings.STATEMENT_TIMEOUTS.get(
+            match.url_name, settings.STATEMENT_TIMEOUT)
+        if timeout:
+            request.statement_timeout = StatementTimeout(connection, timeout)
+            connection.execute_wrappers.append(request.statement_timeout)
+        return None
+
+    def process_exception(self, request, exception):
+        if not is_timeout(exception):
+            return None
+        count('timeout', request.resolver_match.url_name)
+        response = JsonResponse(
+            {'detail': 'Запрос выполнялся слишком долго, '
+                       'попробуйте сузить фильтры.'},
+            status=503, json_dumps_params={'ensure_ascii': False})
+        response['Retry-After'] = '5'
+        return response
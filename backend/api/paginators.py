@@ -1,5 +1,7 @@
+from django.conf import settings
 from rest_framework.pagination import PageNumberPagination
 
 
 class PageLimitPagination(PageNumberPagination):
     page_size_query_param = 'limit'
+    max_page_size = settings.MAX_PAGE_SIZE
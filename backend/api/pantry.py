@@ -0,0 +1,111 @@
+import threading
+import time
+
+from django.conf import settings
+
+from recipe.models import IngredientAmount
+
+
+class PantryIndex:
+    def __init__(self, ttl, max_changes):
+        self.ttl = ttl
+        self.max_changes = max_changes
+        self.recipe_ids = None
+        self.sizes = None
+        self.postings = {}
+        self._changes = {}
+        self._built = None
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._built = None
+
+    def update(self, recipe_id):
+        ingredients = set(IngredientAmount.objects.filter(
+            recipe_id=recipe_id).values_list('ingredients_id', flat=True))
+        with self._lock:
+            self._changes[recipe_id] = ingredients
+            if len(self._changes) > self.max_changes:
+                self._generation += 1
+                self._built = None
+
+    def remove(self, recipe_id):
+        with self._lock:
+            self._changes[recipe_id] = set()
+
+    def build(self):
+        import numpy as np
+
+        with self._lock:
+            generation = self._generation
+            seen = dict(self._changes)
+        pairs = np.fromiter(
+            (value for pair in IngredientAmount.objects.values_list(
+                'recipe_id', 'ingredients_id').iterator() for value in pair),
+            dtype=np.int64).reshape(-1, 2)
+        recipe_ids, rows = np.unique(pairs[:, 0], return_inverse=True)
+        order = np.argsort(pairs[:, 1], kind='stable')
+        ingredient_ids, starts = np.unique(pairs[order, 1], return_index=True)
+        postings = dict(zip(
+            ingredient_ids.tolist(),
+            np.split(rows[order].astype(np.int32), starts[1:])))
+        with self._lock:
+            self.recipe_ids = recipe_ids
+            self.sizes = np.bincount(
+                rows, minlength=len(recipe_ids)).astype(np.int32)
+            self.postings = postings
+            self._changes = {pk: ingredients
+                             for pk, ingredients in self._changes.items()
+                             if seen.get(pk) is not ingredients}
+            if generation == self._generation:
+                self._built = time.monotonic()
+
+    def stale(self):
+        return (self._built is None
+                or time.monotonic() - self._built > self.ttl)
+
+    def refresh(self):
+        if self.stale():
+            with self._build_lock:
+                if self.stale():
+                    self.build()
+
+    def search(self, have, max_missing, limit):
+        import numpy as np
+
+        self.refresh()
+        have = set(have)
+        with self._lock:
+            recipe_ids, sizes = self.recipe_ids, self.sizes
+            posting_rows = [self.postings[pk] for pk in have
+                            if pk in self.postings]
+            changes = dict(self._changes)
+        matched = np.bincount(
+            np.concatenate(posting_rows or [np.empty(0, dtype=np.int32)]),
+            minlength=len(recipe_ids))
+        missing = sizes - matched
+        found = (matched > 0) & (missing <= max_missing)
+        if changes:
+            found &= ~np.isin(recipe_ids, list(changes))
+        ids = recipe_ids[found]
+        matched = matched[found]
+        missing = missing[found]
+        extra = [(pk, len(ingredients & have), len(ingredients - have))
+                 for pk, ingredients in changes.items()]
+        extra = [row for row in extra if row[1] and row[2] <= max_missing]
+        if extra:
+            extra_ids, extra_matched, extra_missing = map(np.array,
+                                                          zip(*extra))
+            ids = np.concatenate([ids, extra_ids])
+            matched = np.concatenate([matched, extra_matched])
+            missing = np.concatenate([missing, extra_missing])
+        order = np.lexsort((ids, -matched, missing))[:limit]
+        return ids[order].tolist()
+
+
+pantry_index = PantryIndex(settings.PANTRY_INDEX_TTL,
+                           settings.PANTRY_INDEX_MAX_CHANGES)
@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from recipe.models import Carts, Favorites, Recipe
+
+
+def decay_rate(half_life_days):
+    return math.log(2) / (half_life_days * 24 * 60 * 60)
+
+
+def add_scores(model, weight, recipe_ids, scores, now, batch_size):
+    rates = np.array([decay_rate(settings.POPULARITY_HALF_LIFE_DAYS),
+                      decay_rate(settings.TRENDING_HALF_LIFE_DAYS)])
+    links = model.objects.filter(recipe_id__lte=recipe_ids[-1])
+    last_pk = 0
+    while True:
+        batch = list(links.filter(pk__gt=last_pk).order_by(
+            'pk').values_list('pk', 'recipe_id', 'created')[:batch_size])
+        if not batch:
+            return
+        last_pk = batch[-1][0]
+        _, recipes, created = zip(*batch)
+        ages = now - np.fromiter((moment.timestamp() for moment in created),
+                                 dtype=np.float64, count=len(created))
+        recipes = np.array(recipes, dtype=np.int64)
+        rows = np.minimum(np.searchsorted(recipe_ids, recipes),
+                          len(recipe_ids) - 1)
+        # Рецепты, которых нет в снимке (созданы во время пересчёта),
+        # пропускаются, а не засчитываются соседней строке.
+        known = recipe_ids[rows] == recipes
+        weights = weight * np.exp(-np.outer(np.maximum(ages, 0), rates))
+        for column in range(scores.shape[1]):
+            scores[:, column] += np.bincount(
+                rows[known], weights=weights[known, column],
+                minlength=len(recipe_ids))
+
+
+def update_scores(batch_size=None):
+    batch_size = batch_size or settings.POPULARITY_BATCH_SIZE
+    now = timezone.now().timestamp()
+    current = np.array(
+        Recipe.objects.order_by('pk').values_list(
+            'pk', 'popularity', 'trending'),
+        dtype=np.float64).reshape(-1, 3)
+    recipe_ids = current[:, 0].astype(np.int64)
+    if not len(recipe_ids):
+        return 0, 0
+    scores = np.zeros((len(recipe_ids), 2))
+    add_scores(Favorites, settings.POPULARITY_FAVORITE_WEIGHT,
+               recipe_ids, scores, now, batch_size)
+    add_scores(Carts, settings.POPULARITY_CART_WEIGHT,
+               recipe_ids, scores, now, batch_size)
+    changed = np.flatnonzero(
+        ~np.isclose(scores, current[:, 1:], rtol=1e-4, atol=1e-6).all(axis=1))
+    for start in range(0, len(changed), batch_size):
+        rows = changed[start:start + batch_size]
+        with transaction.atomic():
+            Recipe.objects.bulk_update(
+                [Recipe(pk=int(recipe_ids[row]),
+                        popularity=float(scores[row, 0]),
+                        trending=float(scores[row, 1]))
+                 for row in rows],
+                ('popularity', 'trending'))
+    return len(recipe_ids), len(changed)
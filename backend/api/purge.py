@@ -0,0 +1,139 @@
+import logging
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import CASCADE
+
+from api.authentication import token_cache
+from api.catalog import bump_catalog_version
+from api.changes import batched_changes, record_links
+from api.facets import links_catalog
+from api.feed import invalidate_feeds
+from api.pantry import pantry_index
+from recipe.models import Carts, ChangeLog, Favorites, PurgeTask, Recipe
+from users.models import Subscriptions, User
+
+logger = logging.getLogger(__name__)
+
+
+def delete_in_batches(queryset, batch_size):
+    total = 0
+    while True:
+        with transaction.atomic():
+            batch = list(queryset.order_by('pk').values_list(
+                'pk', flat=True)[:batch_size])
+            if not batch:
+                return total
+            deleted, _ = queryset.model.objects.filter(pk__in=batch).delete()
+            total += deleted
+
+
+def delete_images(names):
+    names = set(names) - set(Recipe.objects.filter(
+        image__in=names).values_list('image', flat=True))
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except OSError:
+            logger.warning('Не удалось удалить файл %s', name)
+
+
+def purge_recipes(recipe_ids, batch_size=None):
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    recipe_ids = sorted(recipe_ids)
+    links = set()
+    for start in range(0, len(recipe_ids), batch_size):
+        batch = recipe_ids[start:start + batch_size]
+        with transaction.atomic(), batched_changes():
+            images = [name for name in Recipe.objects.filter(
+                pk__in=batch).values_list('image', flat=True) if name]
+            for model in (Favorites, Carts):
+                links.update(model.objects.filter(
+                    recipe_id__in=batch).values_list('user_id', flat=True))
+            Recipe.objects.filter(pk__in=batch).only('pk').delete()
+            transaction.on_commit(lambda images=images: delete_images(images))
+        for pk in batch:
+            pantry_index.remove(pk)
+    for user_id in links:
+        bump_catalog_version(links_catalog(user_id))
+    return len(recipe_ids)
+
+
+def purge_user(user_id, batch_size=None):
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    recipes = Recipe.objects.filter(author_id=user_id)
+    while True:
+        batch = list(recipes.order_by('pk').values_list(
+            'pk', flat=True)[:batch_size])
+        if not batch:
+            break
+        purge_recipes(batch, batch_size)
+    followers = list(Subscriptions.objects.filter(
+        author_id=user_id).values_list('user_id', flat=True))
+    with transaction.atomic():
+        for follower in followers:
+            record_links(Subscriptions, ChangeLog.DELETE, [user_id],
+                         User(pk=follower))
+    for queryset in (Favorites.objects.filter(user_id=user_id),
+                     Carts.objects.filter(user_id=user_id),
+                     Subscriptions.objects.filter(user_id=user_id),
+                     Subscriptions.objects.filter(author_id=user_id)):
+        delete_in_batches(queryset, batch_size)
+    User.objects.filter(pk=user_id).delete()
+    token_cache.forget_user(user_id)
+    invalidate_feeds(followers + [user_id])
+    bump_catalog_version(links_catalog(user_id))
+
+
+def schedule_recipes(recipe_ids):
+    if len(recipe_ids) < settings.PURGE_QUEUE_THRESHOLD:
+        transaction.on_commit(lambda: purge_recipes(recipe_ids))
+        return
+    PurgeTask.objects.bulk_create(
+        [PurgeTask(kind=PurgeTask.RECIPE, object_id=pk)
+         for pk in recipe_ids], ignore_conflicts=True)
+
+
+def schedule_user(user_id):
+    recipes = Recipe.objects.filter(author_id=user_id).count()
+    if recipes < settings.PURGE_QUEUE_THRESHOLD:
+        transaction.on_commit(lambda: purge_user(user_id))
+        return
+    User.objects.filter(pk=user_id).update(is_active=False)
+    transaction.on_commit(lambda: token_cache.forget_user(user_id))
+    PurgeTask.objects.bulk_create(
+        [PurgeTask(kind=PurgeTask.USER, object_id=user_id)],
+        ignore_conflicts=True)
+
+
+def run_queued(limit=None, batch_size=None):
+    limit = limit or settings.PURGE_BATCH_SIZE
+    tasks = list(PurgeTask.objects.values_list(
+        'pk', 'kind', 'object_id')[:limit])
+    recipes = [pk for _, kind, pk in tasks if kind == PurgeTask.RECIPE]
+    if recipes:
+        purge_recipes(recipes, batch_size)
+    for _, kind, pk in tasks:
+        if kind == PurgeTask.USER:
+            purge_user(pk, batch_size)
+    PurgeTask.objects.filter(pk__in=[pk for pk, _, _ in tasks]).delete()
+    return len(tasks)
+
+
+def deletion_perms_needed(admin_site, model, request):
+    perms_needed = set()
+    seen = {model}
+    models = [model]
+    while models:
+        for relation in models.pop()._meta.related_objects:
+            related = relation.related_model
+            if relation.on_delete is not CASCADE or related in seen:
+                continue
+            seen.add(related)
+            models.append(related)
+            model_admin = admin_site._registry.get(related)
+            if (model_admin is not None
+                    and not model_admin.has_delete_permission(request)):
+                perms_needed.add(related._meta.verbose_name)
+    return perms_needed
@@ -0,0 +1,165 @@
+import os
+import threading
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+from recipe.models import Carts, Favorites, IngredientAmount, Recipe
+
+
+def _binary_matrix(pairs, columns, transpose=False):
+    import numpy as np
+    from scipy import sparse
+
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    row_ids, row_index = np.unique(pairs[:, 0], return_inverse=True)
+    column_index = np.searchsorted(columns, pairs[:, 1])
+    matrix = sparse.csr_matrix(
+        (np.ones(len(pairs), dtype=np.float32), (row_index, column_index)),
+        shape=(len(row_ids), len(columns)))
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix.T.tocsr() if transpose else matrix
+
+
+def build_index(top_k=None, ingredient_weight=None):
+    import numpy as np
+
+    top_k = top_k or settings.RECOMMENDATIONS_TOP_K
+    if ingredient_weight is None:
+        ingredient_weight = settings.RECOMMENDATIONS_INGREDIENT_WEIGHT
+    recipe_ids = np.fromiter(
+        Recipe.objects.order_by('pk').values_list('pk', flat=True),
+        dtype=np.int64)
+    total = len(recipe_ids)
+    top_k = min(top_k, max(total - 1, 0))
+    interactions = (
+        list(Favorites.objects.values_list('user_id', 'recipe_id'))
+        + list(Carts.objects.values_list('user_id', 'recipe_id')))
+    # users x recipes
+    users = _binary_matrix(interactions, recipe_ids)
+    # recipes x ingredients
+    ingredients = _binary_matrix(
+        IngredientAmount.objects.values_list('ingredients_id', 'recipe_id'),
+        recipe_ids, transpose=True)
+    users_t = users.T.tocsr()
+    ingredients_t = ingredients.T.tocsc()
+    norms = np.sqrt(np.asarray(users.sum(axis=0)).ravel())
+    sizes = np.asarray(ingredients.sum(axis=1)).ravel()
+
+    neighbors = np.full((total, top_k), -1, dtype=np.int32)
+    scores = np.zeros((total, top_k), dtype=np.float32)
+    block = max(1, settings.RECOMMENDATIONS_BLOCK_CELLS // max(total, 1))
+    for start in range(0, total if top_k else 0, block):
+        stop = min(start + block, total)
+        co = (users_t[start:stop] @ users).toarray()
+        scale = np.outer(norms[start:stop], norms)
+        co = np.divide(co, scale, out=np.zeros_like(co), where=scale > 0)
+        inter = (ingredients[start:stop] @ ingredients_t).toarray()
+        union = sizes[start:stop, None] + sizes[None, :] - inter
+        jaccard = np.divide(inter, union, out=np.zeros_like(inter),
+                            where=union > 0)
+        score = ((1 - ingredient_weight) * co
+                 + ingredient_weight * jaccard).astype(np.float32)
+        score[np.arange(stop - start), np.arange(start, stop)] = 0
+        best = np.argpartition(-score, top_k - 1, axis=1)[:, :top_k]
+        best_scores = np.take_along_axis(score, best, axis=1)
+        order = np.argsort(-best_scores, axis=1)
+        best = np.take_along_axis(best, order, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        neighbors[start:stop] = np.where(best_scores > 0, best, -1)
+        scores[start:stop] = np.where(best_scores > 0, best_scores, 0)
+    return recipe_ids, neighbors, scores
+
+
+def save_index(path=None, **kwargs):
+    import numpy as np
+
+    recipe_ids, neighbors, scores = build_index(**kwargs)
+    path = path or settings.RECOMMENDATIONS_INDEX
+    tmp_path = f'{path}.tmp.npz'
+    np.savez_compressed(tmp_path, recipe_ids=recipe_ids,
+                        neighbors=neighbors, scores=scores)
+    os.replace(tmp_path, path)
+    return len(recipe_ids)
+
+
+class Neighbours(namedtuple('Neighbours', 'recipe_ids neighbors scores')):
+    __slots__ = ()
+
+    def rows(self, ids):
+        import numpy as np
+
+        ids = np.asarray(ids, dtype=np.int64)
+        rows = np.searchsorted(self.recipe_ids, ids)
+        rows = rows[rows < len(self.recipe_ids)]
+        return rows[np.isin(self.recipe_ids[rows], ids)]
+
+    def similar(self, recipe_id, limit):
+        rows = self.rows([recipe_id])
+        if not len(rows):
+            return []
+        neighbors = self.neighbors[rows[0]]
+        return self.recipe_ids[neighbors[neighbors >= 0][:limit]].tolist()
+
+    def recommended(self, seed_ids, limit):
+        import numpy as np
+
+        rows = self.rows(seed_ids)
+        if not len(rows):
+            return []
+        neighbors = self.neighbors[rows].ravel()
+        scores = self.scores[rows].ravel()
+        found = (neighbors >= 0) & ~np.isin(neighbors, rows)
+        candidates, inverse = np.unique(neighbors[found],
+                                        return_inverse=True)
+        totals = np.bincount(inverse, weights=scores[found])
+        best = np.argsort(-totals, kind='stable')[:limit]
+        return self.recipe_ids[candidates[best]].tolist()
+
+
+class SimilarityIndex:
+    check_interval = 30
+
+    def __init__(self, path):
+        self.path = path
+        # Индекс заменяется целиком одним присваиванием: читатель берёт
+        # ссылку один раз и не смешивает массивы старой и новой версий.
+        self.data = None
+        self._mtime = None
+        self._checked = 0
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        import numpy as np
+
+        now = time.monotonic()
+        if now - self._checked < self.check_interval:
+            return self.data
+        with self._lock:
+            self._checked = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                return self.data
+            if mtime == self._mtime:
+                return self.data
+            with np.load(self.path) as data:
+                arrays = [data[name] for name in Neighbours._fields]
+            for array in arrays:
+                array.setflags(write=False)
+            self.data = Neighbours(*arrays)
+            self._mtime = mtime
+            return self.data
+
+    def similar(self, recipe_id, limit):
+        data = self.refresh()
+        return [] if data is None else data.similar(recipe_id, limit)
+
+    def recommended(self, seed_ids, limit):
+        data = self.refresh()
+        return [] if data is None else data.recommended(seed_ids, limit)
+
+
+similarity_index = SimilarityIndex(settings.RECOMMENDATIONS_INDEX)
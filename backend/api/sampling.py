@@ -0,0 +1,78 @@
+import threading
+import time
+
+from django.conf import settings
+
+from api.catalog import catalog_version
+from recipe.models import Recipe
+
+
+class RandomIndex:
+    def __init__(self, interval):
+        self.interval = interval
+        self.version = None
+        self.recipe_ids = None
+        self.by_tag = {}
+        self._rng = None
+        self._checked = None
+        self._lock = threading.Lock()
+        self._build_lock = threading.Lock()
+
+    def build(self, version):
+        import numpy as np
+
+        recipe_ids = np.fromiter(
+            Recipe.objects.order_by().values_list('pk', flat=True).iterator(),
+            dtype=np.int64)
+        pairs = list(Recipe.tags.through.objects.values_list(
+            'tag__slug', 'recipe_id').iterator())
+        by_tag = {}
+        if pairs:
+            slugs, ids = zip(*pairs)
+            slugs = np.array(slugs, dtype=object)
+            ids = np.array(ids, dtype=np.int64)
+            order = np.argsort(slugs, kind='stable')
+            names, starts = np.unique(slugs[order], return_index=True)
+            by_tag = dict(zip(names.tolist(),
+                              np.split(ids[order], starts[1:])))
+        if self._rng is None:
+            self._rng = np.random.default_rng()
+        self.recipe_ids, self.by_tag, self.version = (
+            recipe_ids, by_tag, version)
+
+    def fresh(self):
+        return (self._checked is not None
+                and time.monotonic() - self._checked < self.interval)
+
+    def refresh(self):
+        if self.fresh():
+            return
+        if not self._build_lock.acquire(blocking=self.recipe_ids is None):
+            return
+        try:
+            if self.fresh():
+                return
+            version = catalog_version('recipes')
+            if version != self.version:
+                self.build(version)
+            self._checked = time.monotonic()
+        finally:
+            self._build_lock.release()
+
+    def sample(self, n, tags=()):
+        import numpy as np
+
+        self.refresh()
+        if tags:
+            ids = np.unique(np.concatenate(
+                [self.by_tag.get(slug, self.recipe_ids[:0])
+                 for slug in tags]))
+        else:
+            ids = self.recipe_ids
+        n = min(n, len(ids))
+        with self._lock:
+            rows = self._rng.choice(len(ids), size=n, replace=False)
+        return ids[rows].tolist()
+
+
+random_index = RandomIndex(settings.RANDOM_INDEX_REFRESH)
@@ -1,13 +1,13 @@
+from django.conf import settings
 from django.db.models import F
-from django.shortcuts import get_object_or_404
-from drf_extra_fields.fields import Base64ImageField
-from rest_framework.fields import ReadOnlyField
+from django.http import Http404
+from rest_framework.fields import ListField, ReadOnlyField
 from rest_framework.relations import PrimaryKeyRelatedField
 from rest_framework.serializers import (ModelSerializer, RegexField,
-                                        SerializerMethodField,
+                                        Serializer, SerializerMethodField,
                                         ValidationError, IntegerField)
-from rest_framework.validators import UniqueTogetherValidator
 
+from api.fields import Base64ImageField
 from api.utils import recipe_amount_ingredients_set
 from recipe.models import (Ingredient, Recipe, Tag, Favorites,
                            Carts, IngredientAmount)
@@ -25,35 +25,33 @@ class UserSerializer(ModelSerializer):
         read_only_fields = ('is_subscribed',)
 
     def get_is_subscribed(self, obj):
+        if hasattr(obj, 'is_subscribed'):
+            return obj.is_subscribed
         request = self.context.get('request')
-        return (request and request.user.is_authenticated
-                and obj.following.filter(user=request.user).exists())
+        return bool(request and request.user.is_authenticated
+                    and obj.follower.filter(user=request.user).exists())
 
 
 class FavoriteSerializer(ModelSerializer):
+    unique_message = 'Рецепт уже находится в избранном'
+
     class Meta:
         model = Favorites
         fields = ('user', 'recipe')
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Favorites.objects.all(),
-                fields=['recipe', 'user'],
-                message='Рецепт уже находится в избранном'
-            )
-        ]
 
 
 class ShoppingCartSerializer(ModelSerializer):
+    unique_message = 'Рецепт уже добавлен в список покупок-'
+
     class Meta:
         model = Carts
         fields = ('user', 'recipe')
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Carts.objects.all(),
-                fields=['recipe', 'user'],
-                message='Рецепт уже добавлен в список покупок-'
-            )
-        ]
+
+
+class BulkIdsSerializer(Serializer):
+    ids = ListField(child=IntegerField(min_value=1),
+                    allow_empty=False,
+                    max_length=settings.BULK_MAX_IDS)
 
 
 class RecipeSmallSerializer(ModelSerializer):
@@ -94,16 +92,11 @@ class SubscribeSerializer(ModelSerializer):
 
 
 class FollowSerializer(UserSerializer):
+    unique_message = 'Ошибка'
+
     class Meta:
         model = Subscriptions
         fields = ('user', 'author')
-        validators = [
-            UniqueTogetherValidator(
-                queryset=Subscriptions.objects.all(),
-                fields=('user', 'author'),
-                message='Ошибка'
-            )
-        ]
 
     def to_representation(self, instance):
         return SubscribeSerializer(instance).data
@@ -138,9 +131,7 @@ class UserFollowsSerializer(UserSerializer):
 
 
 class GetIngredientsRecipeSerializer(ModelSerializer):
-    id = ReadOnlyField(source='ingredients.id')
-    name = ReadOnlyField(source='ingredients.name')
-    measurement_unit = ReadOnlyField(source='ingredients.measurement_unit')
+    id = ReadOnlyField(source='ingredients_id')
 
     class Meta:
         model = IngredientAmount
@@ -169,7 +160,7 @@ class TagSerializer(ModelSerializer):
 class IngredientSerializer(ModelSerializer):
     class Meta:
         model = Ingredient
-        fields = '__all__'
+        fields = ('id', 'name', 'measurement_unit')
         read_only_fields = ['__all__']
 
 
@@ -190,8 +181,23 @@ class GetRecipeSerializer(ModelSerializer):
                   'tags', 'cooking_time',
                   'is_in_shopping_cart',
                   'is_favorited')
-
-    def _exist(self, model, obj):
+        compact_fields = ('id', 'author', 'name',
+                          'image', 'tags', 'cooking_time',
+                          'is_in_shopping_cart',
+                          'is_favorited')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selected = self.context.get('fields')
+        if selected is None:
+            return fields
+        return {name: field for name, field in fields.items()
+                if name in selected}
+
+    def _exist(self, model, obj, annotation):
+        annotated = getattr(obj, annotation, None)
+        if annotated is not None:
+            return annotated
         request = self.context.get('request')
         if not request or request.user.is_anonymous:
             return False
@@ -201,10 +207,10 @@ class GetRecipeSerializer(ModelSerializer):
         ).exists()
 
     def get_is_favorited(self, obj):
-        return self._exist(Favorites, obj)
+        return self._exist(Favorites, obj, 'is_favorited')
 
     def get_is_in_shopping_cart(self, obj):
-        return self._exist(Carts, obj)
+        return self._exist(Carts, obj, 'is_in_shopping_cart')
 
 
 class SerializerRecipeCookingTime(ModelSerializer):
@@ -282,12 +288,14 @@ class RecipeSerializer(ModelSerializer):
             recipe.tags.add(tag)
 
     def create_ingredients(self, recipe, ingredients):
+        catalog = Ingredient.objects.in_bulk(
+            [ingredient['id'] for ingredient in ingredients])
+        if len(catalog) != len(ingredients):
+            raise Http404
         IngredientAmount.objects.bulk_create(
             [IngredientAmount(recipe=recipe,
-                              ingredients=get_object_or_404(Ingredient,
-                                                            pk=ingredient[
-                                                                'id']),
-                              amount=ingredient['amount'])
+                              ingredients=catalog[ingredient['id']],
+                              amount=ingredient['amount']).copy_ingredient()
              for ingredient in ingredients])
 
     def create(self, validated_data):
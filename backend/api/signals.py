@@ -0,0 +1,65 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from api.authentication import token_cache
+from api.catalog import bump_catalog_version
+from api.changes import record_changes
+from recipe.models import ChangeLog, Ingredient, IngredientAmount, Recipe, Tag
+from users.models import User
+
+
+@receiver(post_delete, sender=Token)
+def forget_deleted_token(sender, instance, **kwargs):
+    token_cache.delete(instance.key)
+
+
+@receiver(post_save, sender=User)
+def forget_user_tokens(sender, instance, created, update_fields, **kwargs):
+    if created or update_fields == frozenset(('last_login',)):
+        return
+    token_cache.forget_user(instance.pk)
+
+
+@receiver(post_save, sender=Tag)
+@receiver(post_delete, sender=Tag)
+def invalidate_tags_catalog(sender, **kwargs):
+    bump_catalog_version('tags')
+    bump_catalog_version('recipes')
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_delete, sender=Recipe)
+@receiver(m2m_changed, sender=Recipe.tags.through)
+def invalidate_recipe_facets(sender, **kwargs):
+    bump_catalog_version('recipes')
+
+
+@receiver(post_save, sender=Ingredient)
+@receiver(post_delete, sender=Ingredient)
+def invalidate_ingredients_catalog(sender, **kwargs):
+    bump_catalog_version('ingredients')
+
+
+@receiver(post_save, sender=Recipe)
+@receiver(post_save, sender=Tag)
+@receiver(post_save, sender=Ingredient)
+def record_upsert(sender, instance, **kwargs):
+    record_changes(sender._meta.model_name, ChangeLog.UPSERT, [instance.pk])
+
+
+@receiver(post_delete, sender=Recipe)
+@receiver(post_delete, sender=Tag)
+@receiver(post_delete, sender=Ingredient)
+def record_delete(sender, instance, **kwargs):
+    record_changes(sender._meta.model_name, ChangeLog.DELETE, [instance.pk])
+
+
+@receiver(post_save, sender=Ingredient)
+def sync_ingredient_rows(sender, instance, created, **kwargs):
+    if created:
+        return
+    fields = {field: getattr(instance, field)
+              for field in IngredientAmount.COPIED_FIELDS}
+    IngredientAmount.objects.filter(ingredients=instance).exclude(
+        **fields).update(**fields)
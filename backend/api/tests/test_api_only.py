@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+SCRIPT = '''
+import django
+from django.core.management import call_command
+from django.test import Client
+
+django.setup()
+call_command('migrate', verbosity=0)
+
+from rest_framework.authtoken.models import Token
+from users.models import User
+
+user = User.objects.create(username='cook', email='cook@example.com')
+token = Token.objects.create(user=user)
+print(Client().get('/api/tags/').status_code,
+      Client().get('/api/users/me/',
+                   HTTP_AUTHORIZATION=f'Token {token.key}').status_code,
+      Client().get('/admin/').status_code)
+'''
+
+
+class ApiOnlyTests(SimpleTestCase):
+
+    def test_api_responds_without_admin_apps(self):
+        env = dict(os.environ, API_ONLY='True',
+                   SQLITE_NAME=':memory:',
+                   DJANGO_SETTINGS_MODULE='foodgram.settings')
+        for name in ('TEST_BASE', 'WEB_CONCURRENCY'):
+            env.pop(name, None)
+        result = subprocess.run(
+            [sys.executable, '-c', SCRIPT], cwd=settings.BASE_DIR, env=env,
+            capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.split(), ['200', '200', '404'])
@@ -0,0 +1,47 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.authentication import token_cache
+from users.models import User
+
+
+@mock.patch.object(token_cache, 'alias', 'default')
+class TokenCacheTests(TestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='cook', email='cook@example.com', password='pass-1234',
+            first_name='Cook', last_name='Cook')
+        self.token = Token.objects.create(user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.token.key}')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_cached_user_is_a_copy(self):
+        self.client.get('/api/users/me/')
+        first = token_cache.get(self.token.key).user
+        first.first_name = 'Changed'
+        self.assertEqual(token_cache.get(self.token.key).user.first_name,
+                         'Cook')
+
+    def test_deactivation_evicts_token(self):
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 200)
+        self.user.is_active = False
+        self.user.save(update_fields=['is_active'])
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+    def test_logout_evicts_token(self):
+        self.client.get('/api/users/me/')
+        self.client.post('/api/auth/token/logout/')
+        self.assertEqual(self.client.get('/api/users/me/').status_code, 401)
+
+    def test_login_does_not_evict(self):
+        self.client.get('/api/users/me/')
+        self.user.save(update_fields=['last_login'])
+        self.assertIsNotNone(token_cache.get(self.token.key))
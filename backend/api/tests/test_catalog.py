@@ -0,0 +1,30 @@
+from django.core.cache import cache, caches
+from django.test import TestCase
+
+from api.catalog import version_key
+from recipe.models import Tag
+
+
+class CatalogTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        caches['shared'].clear()
+        Tag.objects.create(name='Завтрак', slug='breakfast')
+
+    def test_version_in_shared_cache(self):
+        self.client.get('/api/tags/')
+        version = caches['shared'].get(version_key('tags'))
+        self.assertIsNotNone(version)
+        Tag.objects.create(name='Обед', slug='lunch')
+        self.assertNotEqual(caches['shared'].get(version_key('tags')),
+                            version)
+        self.assertEqual(len(self.client.get('/api/tags/').json()), 2)
+
+    def test_weak_etag(self):
+        response = self.client.get('/api/tags/', HTTP_ACCEPT_ENCODING='gzip')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/"'))
+        self.assertIn('Accept-Encoding', response['Vary'])
+        response = self.client.get('/api/tags/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
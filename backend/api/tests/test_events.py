@@ -0,0 +1,60 @@
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from api.events import authenticate, broker, events_application
+from api.tests.utils import auth_client, create_user
+
+
+def open_stream(query):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.disconnect'}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {'type': 'http', 'path': '/api/events/', 'headers': [],
+             'query_string': query.encode()}
+    async_to_sync(events_application)(scope, receive, send)
+    return messages[0]['status']
+
+
+class EventTicketTests(TestCase):
+
+    def setUp(self):
+        patcher = mock.patch('api.events.close_old_connections')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.user = create_user('cook')
+        self.client = auth_client(self.user)
+
+    def ticket(self):
+        response = self.client.post('/api/events/tickets/')
+        self.assertEqual(response.status_code, 201)
+        return response.data['ticket']
+
+    def test_ticket_requires_authentication(self):
+        response = APIClient().post('/api/events/tickets/')
+        self.assertEqual(response.status_code, 401)
+
+    def test_ticket_authenticates_user(self):
+        self.assertEqual(authenticate('', self.ticket()), self.user)
+
+    def test_expired_or_forged_ticket_rejected(self):
+        ticket = self.ticket()
+        with override_settings(EVENTS_TICKET_TTL=-1):
+            self.assertIsNone(authenticate('', ticket))
+        self.assertIsNone(authenticate('', ticket + 'x'))
+
+    def test_stream_accepts_ticket(self):
+        with mock.patch.object(broker, '_poller', True):
+            self.assertEqual(open_stream(f'ticket={self.ticket()}'), 200)
+
+    def test_token_in_query_rejected(self):
+        key = Token.objects.get(user=self.user).key
+        self.assertEqual(open_stream(f'token={key}'), 401)
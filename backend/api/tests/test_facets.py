@@ -0,0 +1,34 @@
+from django.core.cache import caches
+from django.test import TestCase
+
+from api.tests.utils import auth_client, create_recipe, create_user
+from recipe.models import Tag
+
+
+class TagFacetsTests(TestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.user = create_user('cook')
+        self.tag = Tag.objects.create(name='Завтрак', slug='breakfast')
+        self.recipe = create_recipe(self.user)
+        self.recipe.tags.add(self.tag)
+
+    def facets(self, client=None, **params):
+        response = (client or self.client).get(
+            '/api/recipes/', {'facets': 'tags', **params})
+        return {row['slug']: row['count']
+                for row in response.data['facets']['tags']}
+
+    def test_counts_follow_recipe_writes(self):
+        self.assertEqual(self.facets(), {'breakfast': 1})
+        create_recipe(self.user, name='Омлет').tags.add(self.tag)
+        self.assertEqual(self.facets(), {'breakfast': 2})
+
+    def test_counts_follow_favorites(self):
+        client = auth_client(self.user)
+        self.assertEqual(self.facets(client, is_favorited=1),
+                         {'breakfast': 0})
+        client.post(f'/api/recipes/{self.recipe.pk}/favorite/')
+        self.assertEqual(self.facets(client, is_favorited=1),
+                         {'breakfast': 1})
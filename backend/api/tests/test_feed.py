@@ -0,0 +1,33 @@
+from django.core.cache import caches
+from django.test import TestCase
+
+from api.feed import fan_out, feed_key
+from api.tests.utils import auth_client, create_recipe, create_user
+
+
+class FeedTests(TestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.user = create_user('cook')
+        self.author = create_user('author')
+        self.client = auth_client(self.user)
+        self.client.post(f'/api/users/{self.author.pk}/subscribe/')
+
+    def feed(self):
+        return [recipe['id'] for recipe in
+                self.client.get('/api/recipes/feed/').data['results']]
+
+    def test_fan_out_updates_shared_feed(self):
+        self.assertEqual(self.feed(), [])
+        self.assertEqual(caches['shared'].get(feed_key(self.user.pk)), [])
+        recipe = create_recipe(self.author)
+        fan_out(recipe)
+        self.assertEqual(caches['shared'].get(feed_key(self.user.pk)),
+                         [recipe.pk])
+        self.assertEqual(self.feed(), [recipe.pk])
+
+    def test_unsubscribe_invalidates_feed(self):
+        self.feed()
+        self.client.delete(f'/api/users/{self.author.pk}/subscribe/')
+        self.assertIsNone(caches['shared'].get(feed_key(self.user.pk)))
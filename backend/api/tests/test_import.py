@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from api.management.commands.import_recipes import UPLOAD_TO, Command
+from api.sampling import RandomIndex
+from api.tests.utils import create_recipe
+from recipe.models import Recipe
+from users.models import User
+
+
+def recipe_record(name):
+    return {
+        'author': {'email': 'author@example.com', 'username': 'author',
+                   'first_name': 'Author', 'last_name': 'Author'},
+        'name': name, 'text': 'Текст', 'cooking_time': 10,
+        'image': 'image.png',
+        'tags': [{'name': 'Завтрак', 'slug': 'breakfast',
+                  'color': '#ffffff'}],
+        'ingredients': [{'name': 'соль', 'measurement_unit': 'г',
+                         'amount': 5}],
+    }
+
+
+class ImportRecipesTests(TestCase):
+
+    def setUp(self):
+        self.media = tempfile.TemporaryDirectory()
+        self.source = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.source.name, 'recipes.jsonl')
+        os.makedirs(f'{self.path}.images')
+        Image.new('RGB', (1, 1)).save(f'{self.path}.images/image.png')
+        self.settings = override_settings(MEDIA_ROOT=self.media.name)
+        self.settings.enable()
+
+    def tearDown(self):
+        self.settings.disable()
+        self.media.cleanup()
+        self.source.cleanup()
+
+    def write(self, *names):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            for name in names:
+                file.write(json.dumps(recipe_record(name)) + '\n')
+
+    def stored_images(self):
+        return set(os.listdir(os.path.join(self.media.name, UPLOAD_TO)))
+
+    def call(self):
+        call_command('import_recipes', self.path, '--workers', '1',
+                     stdout=open(os.devnull, 'w'))
+
+    def test_duplicates_in_batch_copy_one_image(self):
+        self.write('Борщ', 'Борщ', 'Суп')
+        self.call()
+        self.assertEqual(Recipe.objects.count(), 2)
+        self.assertEqual(
+            self.stored_images(),
+            {os.path.basename(name) for name in
+             Recipe.objects.values_list('image', flat=True)})
+
+    def test_conflicting_row_image_is_deleted(self):
+        self.write('Борщ', 'Суп')
+        get_tags = Command.get_tags
+
+        def insert_concurrently(command, records):
+            create_recipe(User.objects.get(username='author'), name='Борщ')
+            return get_tags(command, records)
+
+        with mock.patch.object(Command, 'get_tags', insert_concurrently):
+            self.call()
+        soup = Recipe.objects.get(name='Суп')
+        borscht = Recipe.objects.get(name='Борщ')
+        self.assertEqual(self.stored_images(),
+                         {os.path.basename(soup.image.name)})
+        self.assertEqual(borscht.image.name, 'recipes/test.png')
+        self.assertFalse(borscht.tags.exists())
+        self.assertEqual(soup.tags.count(), 1)
+
+    def test_import_refreshes_recipe_catalog(self):
+        index = RandomIndex(interval=0)
+        self.assertEqual(index.sample(5), [])
+        self.write('Борщ')
+        self.call()
+        self.assertEqual(index.sample(5), [Recipe.objects.get().pk])
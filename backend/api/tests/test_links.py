@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from api.tests.utils import auth_client, create_recipe, create_user
+from recipe.models import Favorites
+from users.models import Subscriptions
+
+
+class CreateLinkTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user('cook')
+        self.author = create_user('author')
+        self.recipe = create_recipe(self.author)
+        self.client = auth_client(self.user)
+
+    def test_favorite_missing_recipe(self):
+        response = self.client.post(
+            f'/api/recipes/{self.recipe.pk + 1000}/favorite/')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Favorites.objects.exists())
+
+    def test_favorite_twice(self):
+        url = f'/api/recipes/{self.recipe.pk}/favorite/'
+        self.assertEqual(self.client.post(url).status_code, 201)
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.assertEqual(Favorites.objects.count(), 1)
+
+    def test_subscribe_missing_author(self):
+        response = self.client.post(
+            f'/api/users/{self.author.pk + 1000}/subscribe/')
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Subscriptions.objects.exists())
+
+    def test_subscribe_self(self):
+        response = self.client.post(f'/api/users/{self.user.pk}/subscribe/')
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,42 @@
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import AsyncClient, TestCase
+from rest_framework.test import APIClient
+
+from api.tests.utils import create_recipe, create_user
+
+
+def execute_wrappers():
+    return list(connection.execute_wrappers)
+
+
+def statement_timeout():
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SHOW statement_timeout')
+        return cursor.fetchone()[0]
+
+
+class StatementTimeoutMiddlewareTests(TestCase):
+
+    def setUp(self):
+        create_recipe(create_user('author'))
+        self.initial_timeout = statement_timeout()
+
+    def test_sync_requests_remove_wrappers(self):
+        client = APIClient()
+        for _ in range(2):
+            response = client.get('/api/recipes/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(connection.execute_wrappers, [])
+            self.assertEqual(statement_timeout(), self.initial_timeout)
+
+    async def test_async_requests_remove_wrappers(self):
+        client = AsyncClient()
+        for _ in range(2):
+            response = await client.get('/api/recipes/')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(await sync_to_async(execute_wrappers)(), [])
+            self.assertEqual(await sync_to_async(statement_timeout)(),
+                             self.initial_timeout)
@@ -0,0 +1,28 @@
+import threading
+import time
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+from api.pantry import PantryIndex
+
+
+class PantryRefreshTests(SimpleTestCase):
+
+    def test_concurrent_refresh_builds_once(self):
+        index = PantryIndex(ttl=300, max_changes=10)
+        calls = []
+
+        def build():
+            calls.append(1)
+            time.sleep(0.05)
+            index._built = time.monotonic()
+
+        with mock.patch.object(index, 'build', side_effect=build):
+            threads = [threading.Thread(target=index.refresh)
+                       for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(calls), 1)
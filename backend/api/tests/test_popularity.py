@@ -0,0 +1,53 @@
+import datetime
+
+import numpy as np
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from api.popularity import add_scores, update_scores
+from api.tests.utils import create_recipe, create_user
+from recipe.models import Carts, Favorites, Recipe
+
+
+@override_settings(POPULARITY_HALF_LIFE_DAYS=30, TRENDING_HALF_LIFE_DAYS=2,
+                   POPULARITY_FAVORITE_WEIGHT=1.0, POPULARITY_CART_WEIGHT=0.5)
+class PopularityTests(TestCase):
+
+    def setUp(self):
+        self.author = create_user('author')
+        self.user = create_user('cook')
+        self.recipe = create_recipe(self.author)
+
+    def scores(self, recipe):
+        recipe = Recipe.objects.get(pk=recipe.pk)
+        return recipe.popularity, recipe.trending
+
+    def test_favorite_and_cart_weights(self):
+        Favorites.objects.create(user=self.user, recipe=self.recipe)
+        Carts.objects.create(user=self.user, recipe=self.recipe)
+        self.assertEqual(update_scores(), (1, 1))
+        popularity, trending = self.scores(self.recipe)
+        self.assertAlmostEqual(popularity, 1.5, places=3)
+        self.assertAlmostEqual(trending, 1.5, places=3)
+        self.assertEqual(update_scores(), (1, 0))
+
+    def test_scores_decay_by_half_life(self):
+        Favorites.objects.create(user=self.user, recipe=self.recipe)
+        Favorites.objects.update(
+            created=timezone.now() - datetime.timedelta(days=2))
+        update_scores()
+        popularity, trending = self.scores(self.recipe)
+        self.assertAlmostEqual(popularity, 0.5 ** (2 / 30), places=3)
+        self.assertAlmostEqual(trending, 0.5, places=3)
+
+    def test_recipes_missing_from_snapshot_are_skipped(self):
+        middle = create_recipe(self.author, 'Средний')
+        last = create_recipe(self.author, 'Последний')
+        late = create_recipe(self.author, 'Новый')
+        for recipe in (middle, late):
+            Favorites.objects.create(user=self.user, recipe=recipe)
+        recipe_ids = np.array([self.recipe.pk, last.pk], dtype=np.int64)
+        scores = np.zeros((2, 2))
+        add_scores(Favorites, 1.0, recipe_ids, scores,
+                   timezone.now().timestamp(), batch_size=1)
+        np.testing.assert_array_equal(scores, np.zeros((2, 2)))
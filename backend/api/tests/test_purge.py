@@ -0,0 +1,97 @@
+from io import StringIO
+
+from django.contrib.admin import site
+from django.contrib.auth.models import Permission
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase, override_settings
+
+from api.purge import purge_recipes, purge_user, schedule_recipes
+from api.tests.utils import create_recipe, create_user
+from recipe.admin import RecipeAdmin
+from recipe.models import ChangeLog, Favorites, PurgeTask, Recipe
+from users.models import Subscriptions, User
+
+
+class PurgeTests(TestCase):
+
+    def setUp(self):
+        self.author = create_user('author')
+        self.reader = create_user('reader')
+        self.recipes = [create_recipe(self.author, name=f'Рецепт {n}')
+                        for n in range(5)]
+        Favorites.objects.bulk_create(
+            Favorites(user=self.reader, recipe=recipe)
+            for recipe in self.recipes)
+        Subscriptions.objects.create(user=self.reader, author=self.author)
+
+    def test_purge_recipes_in_batches(self):
+        purge_recipes([recipe.pk for recipe in self.recipes], batch_size=2)
+        self.assertFalse(Recipe.objects.exists())
+        self.assertFalse(Favorites.objects.exists())
+        self.assertEqual(
+            set(ChangeLog.objects.filter(
+                kind='recipe', action=ChangeLog.DELETE
+            ).values_list('object_id', flat=True)),
+            {recipe.pk for recipe in self.recipes})
+
+    def test_purge_user(self):
+        purge_user(self.author.pk, batch_size=2)
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        self.assertFalse(Recipe.objects.exists())
+        self.assertFalse(Subscriptions.objects.exists())
+
+    def login_admin(self):
+        admin = User.objects.create_superuser(
+            email='admin@example.com', username='admin', password=None,
+            first_name='Admin', last_name='Admin')
+        self.client.force_login(admin)
+
+    def test_admin_delete_runs_after_commit(self):
+        self.login_admin()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post(
+                f'/admin/users/user/{self.author.pk}/delete/',
+                {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(len(callbacks), 1)
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+
+    @override_settings(PURGE_QUEUE_THRESHOLD=5)
+    def test_large_admin_delete_is_queued(self):
+        self.login_admin()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/admin/users/user/{self.author.pk}/delete/',
+                {'post': 'yes'})
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(User.objects.get(pk=self.author.pk).is_active)
+        self.assertEqual(Recipe.objects.count(), 5)
+        self.assertEqual(list(PurgeTask.objects.values_list(
+            'kind', 'object_id')), [(PurgeTask.USER, self.author.pk)])
+        call_command('run_purges', stdout=StringIO())
+        self.assertFalse(User.objects.filter(pk=self.author.pk).exists())
+        self.assertFalse(Recipe.objects.exists())
+        self.assertFalse(PurgeTask.objects.exists())
+
+    @override_settings(PURGE_QUEUE_THRESHOLD=3)
+    def test_recipe_purge_threshold(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule_recipes([self.recipes[0].pk, self.recipes[1].pk])
+            schedule_recipes([recipe.pk for recipe in self.recipes[2:]])
+        self.assertEqual(Recipe.objects.count(), 3)
+        self.assertEqual(PurgeTask.objects.count(), 3)
+        call_command('run_purges', stdout=StringIO())
+        self.assertFalse(Recipe.objects.exists())
+        self.assertFalse(PurgeTask.objects.exists())
+
+    def test_admin_keeps_permission_check(self):
+        staff = create_user('staff')
+        staff.is_staff = True
+        staff.save()
+        staff.user_permissions.add(
+            Permission.objects.get(codename='delete_recipe'))
+        request = RequestFactory().get('/')
+        request.user = User.objects.get(pk=staff.pk)
+        _, _, perms_needed, _ = RecipeAdmin(
+            Recipe, site).get_deleted_objects(self.recipes, request)
+        self.assertEqual(perms_needed, {'Ингредиент'})
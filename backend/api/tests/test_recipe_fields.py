@@ -0,0 +1,33 @@
+from django.test import TestCase
+
+from api.tests.utils import create_recipe, create_user
+
+
+class RecipeFieldsTests(TestCase):
+
+    def setUp(self):
+        self.recipe = create_recipe(create_user('author'))
+
+    def test_list_is_full_by_default(self):
+        recipe = self.client.get('/api/recipes/').data['results'][0]
+        self.assertIn('text', recipe)
+        self.assertIn('ingredients', recipe)
+
+    def test_compact_list(self):
+        recipe = self.client.get(
+            '/api/recipes/', {'fields': 'compact'}).data['results'][0]
+        self.assertNotIn('text', recipe)
+        self.assertNotIn('ingredients', recipe)
+        self.assertIn('cooking_time', recipe)
+
+    def test_compact_with_expand(self):
+        recipe = self.client.get(
+            '/api/recipes/',
+            {'fields': 'compact', 'expand': 'text'}).data['results'][0]
+        self.assertIn('text', recipe)
+        self.assertNotIn('ingredients', recipe)
+
+    def test_selected_fields(self):
+        recipe = self.client.get(
+            f'/api/recipes/{self.recipe.pk}/', {'fields': 'name'}).data
+        self.assertEqual(set(recipe), {'id', 'name'})
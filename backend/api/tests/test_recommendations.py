@@ -0,0 +1,68 @@
+import os
+import tempfile
+
+from django.test import TestCase
+
+from api.recommendations import SimilarityIndex, build_index, save_index
+from api.tests.utils import create_recipe, create_user
+from recipe.models import Favorites, Ingredient, IngredientAmount
+
+
+class RecommendationsTests(TestCase):
+
+    def setUp(self):
+        author = create_user('author')
+        self.first, self.second, self.third = (
+            create_recipe(author, name) for name in ('А', 'Б', 'В'))
+        for name, recipes in (('one', (self.first, self.second)),
+                              ('two', (self.first, self.second)),
+                              ('three', (self.first, self.third))):
+            user = create_user(name)
+            for recipe in recipes:
+                Favorites.objects.create(user=user, recipe=recipe)
+        salt = Ingredient.objects.create(name='Соль', measurement_unit='г')
+        sugar = Ingredient.objects.create(name='Сахар', measurement_unit='г')
+        for recipe, ingredient in ((self.first, salt), (self.third, salt),
+                                   (self.second, sugar)):
+            IngredientAmount.objects.create(
+                recipe=recipe, ingredients=ingredient, amount=1)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'index.npz')
+
+    def similar(self, **kwargs):
+        recipe_ids, neighbors, _ = build_index(**kwargs)
+        row = list(recipe_ids).index(self.first.pk)
+        return [int(recipe_ids[column]) for column in neighbors[row]
+                if column >= 0]
+
+    def test_ingredient_weight_changes_order(self):
+        self.assertEqual(self.similar(top_k=2, ingredient_weight=0),
+                         [self.second.pk, self.third.pk])
+        self.assertEqual(self.similar(top_k=2, ingredient_weight=0.3),
+                         [self.third.pk, self.second.pk])
+
+    def test_top_k(self):
+        self.assertEqual(self.similar(top_k=1, ingredient_weight=0),
+                         [self.second.pk])
+
+    def test_recommended_excludes_seeds(self):
+        save_index(self.path, top_k=2, ingredient_weight=0)
+        index = SimilarityIndex(self.path)
+        self.assertEqual(index.recommended([self.first.pk, self.second.pk],
+                                           10), [self.third.pk])
+
+    def test_reload_on_mtime_change(self):
+        save_index(self.path, top_k=2, ingredient_weight=0)
+        index = SimilarityIndex(self.path)
+        index.check_interval = 0
+        self.assertEqual(index.similar(self.first.pk, 10),
+                         [self.second.pk, self.third.pk])
+        data = index.data
+        save_index(self.path, top_k=1, ingredient_weight=0.3)
+        mtime = os.path.getmtime(self.path) + 1
+        os.utime(self.path, (mtime, mtime))
+        self.assertEqual(index.similar(self.first.pk, 10), [self.third.pk])
+        self.assertIsNot(index.data, data)
+        self.assertEqual(data.similar(self.first.pk, 10),
+                         [self.second.pk, self.third.pk])
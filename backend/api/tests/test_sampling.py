@@ -0,0 +1,40 @@
+from unittest import mock
+
+from django.core.cache import caches
+from django.test import TestCase
+
+from api.sampling import RandomIndex
+from api.tests.utils import create_recipe, create_user
+from recipe.models import Tag
+
+
+class RandomIndexTests(TestCase):
+
+    def setUp(self):
+        caches['shared'].clear()
+        self.author = create_user('author')
+        self.recipe = create_recipe(self.author)
+
+    def test_rebuild_is_debounced(self):
+        index = RandomIndex(interval=60)
+        self.assertEqual(index.sample(5), [self.recipe.pk])
+        with mock.patch.object(index, 'build') as build:
+            create_recipe(self.author, name='Омлет')
+            index.sample(5)
+        build.assert_not_called()
+
+    def test_rebuild_after_interval(self):
+        index = RandomIndex(interval=0)
+        index.sample(5)
+        tag = Tag.objects.create(name='Завтрак', slug='breakfast')
+        other = create_recipe(self.author, name='Омлет')
+        other.tags.add(tag)
+        self.assertEqual(sorted(index.sample(5)),
+                         [self.recipe.pk, other.pk])
+        self.assertEqual(index.sample(5, ['breakfast']), [other.pk])
+
+    def test_endpoint_skips_deleted(self):
+        self.client.get('/api/recipes/random/')
+        self.recipe.delete()
+        response = self.client.get('/api/recipes/random/')
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,31 @@
+from django.test import TestCase
+
+from api.tests.utils import create_recipe, create_user
+from recipe.models import Recipe
+
+
+class RecipeSearchTests(TestCase):
+
+    def setUp(self):
+        author = create_user('author')
+        self.title = create_recipe(author, name='Борщ')
+        self.text = create_recipe(author, name='Суп')
+        Recipe.objects.filter(pk=self.text.pk).update(
+            text='Почти борщ', popularity=10)
+        create_recipe(author, name='Каша')
+
+    def search(self, **params):
+        response = self.client.get('/api/recipes/', params)
+        self.assertEqual(response.status_code, 200)
+        return [recipe['id'] for recipe in response.data['results']]
+
+    def test_ranked_by_relevance(self):
+        self.assertEqual(self.search(search='борщ'),
+                         [self.title.pk, self.text.pk])
+
+    def test_rank_precedes_ordering(self):
+        self.assertEqual(self.search(search='борщ', ordering='popular'),
+                         [self.title.pk, self.text.pk])
+
+    def test_ordering_without_search(self):
+        self.assertEqual(self.search(ordering='popular')[0], self.text.pk)
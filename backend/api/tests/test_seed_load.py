@@ -0,0 +1,20 @@
+import tempfile
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from api.sampling import RandomIndex
+from recipe.models import Recipe
+
+
+class SeedLoadTests(TestCase):
+
+    def test_seed_refreshes_recipe_catalog(self):
+        index = RandomIndex(interval=0)
+        self.assertEqual(index.sample(5), [])
+        with tempfile.TemporaryDirectory() as media, \
+                override_settings(MEDIA_ROOT=media):
+            call_command('seed_load', '--users', '5', '--recipes', '10',
+                         '--seed', '1', stdout=StringIO())
+        self.assertEqual(len(index.sample(20)), Recipe.objects.count())
@@ -0,0 +1,45 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from api.tests.utils import auth_client, create_recipe, create_user
+from recipe.models import Carts, Ingredient, IngredientAmount
+
+
+class ShoppingCartTests(TestCase):
+
+    def setUp(self):
+        self.user = create_user('cook')
+        self.client = auth_client(self.user)
+        self.tomatoes = Ingredient.objects.create(
+            name='Томаты', measurement_unit='кг')
+        self.pomodoro = Ingredient.objects.create(
+            name='помидоры', measurement_unit='г')
+        for number, (ingredient, amount) in enumerate(
+                ((self.tomatoes, 2), (self.pomodoro, 300))):
+            recipe = create_recipe(self.user, f'Рецепт {number}')
+            IngredientAmount.objects.create(
+                recipe=recipe, ingredients=ingredient, amount=amount)
+            Carts.objects.create(user=self.user, recipe=recipe)
+
+    def rows(self):
+        response = self.client.get('/api/recipes/download_shopping_cart/')
+        return response.content.decode().splitlines()[4:-2]
+
+    def test_amounts_summed_in_base_units(self):
+        self.assertEqual(self.rows(), ['помидоры,2300,г'])
+
+    def test_rows_copy_ingredient_units(self):
+        self.tomatoes.measurement_unit = 'г'
+        self.tomatoes.save()
+        self.assertEqual(self.rows(), ['помидоры,302,г'])
+
+    def test_normalize_command_updates_rows(self):
+        Ingredient.objects.filter(pk=self.tomatoes.pk).update(
+            canonical_name='томаты', base_unit='кг', unit_factor=1)
+        IngredientAmount.objects.filter(ingredients=self.tomatoes).update(
+            canonical_name='томаты', base_unit='кг', unit_factor=1)
+        self.assertEqual(self.rows(), ['помидоры,300,г', 'томаты,2,кг'])
+        call_command('normalize_ingredients', stdout=StringIO())
+        self.assertEqual(self.rows(), ['помидоры,2300,г'])
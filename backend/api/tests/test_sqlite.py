@@ -0,0 +1,45 @@
+import threading
+from unittest import skipUnless
+
+from django.db import connections, transaction
+from django.test import TransactionTestCase
+
+from foodgram.sqlite.base import DatabaseWrapper, writer_lock
+from recipe.models import Tag
+
+
+def lock_is_free():
+    result = []
+
+    def try_acquire():
+        result.append(writer_lock.acquire(blocking=False))
+        if result[0]:
+            writer_lock.release()
+
+    thread = threading.Thread(target=try_acquire)
+    thread.start()
+    thread.join()
+    return result[0]
+
+
+connection = connections['default']
+
+
+@skipUnless(isinstance(connection, DatabaseWrapper), 'только для SQLite')
+class WriterLockTests(TransactionTestCase):
+
+    def test_read_only_transaction_does_not_lock(self):
+        with transaction.atomic():
+            self.assertFalse(Tag.objects.exists())
+            self.assertFalse(connection.holds_writer)
+            self.assertTrue(lock_is_free())
+
+    def test_first_write_takes_lock_until_commit(self):
+        with transaction.atomic():
+            Tag.objects.exists()
+            Tag.objects.create(name='Завтрак', color='#FFFFFF',
+                               slug='breakfast')
+            self.assertTrue(connection.holds_writer)
+            self.assertFalse(lock_is_free())
+        self.assertFalse(connection.holds_writer)
+        self.assertTrue(lock_is_free())
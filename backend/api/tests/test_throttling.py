@@ -0,0 +1,104 @@
+import threading
+import time
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from api.throttling import (LocalBucketStore, SharedBucketStore,
+                            throttle_store)
+
+RATE = (1.0, 2.0)
+
+
+class BucketStoreTests:
+
+    def setUp(self):
+        self.now = 1000.0
+        patcher = mock.patch.object(type(self.store), 'clock',
+                                    lambda *args: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.store.clear()
+
+    def idle(self, seconds):
+        self.now += seconds
+
+    def take(self):
+        return self.store.take('scope:user:1', *RATE)
+
+    def test_burst_then_wait(self):
+        self.assertEqual([self.take() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(self.take(), 1.0)
+
+    def test_refill(self):
+        for _ in range(3):
+            self.take()
+        self.now += 1.0
+        self.assertEqual(self.take(), 0)
+        self.assertAlmostEqual(self.take(), 1.0)
+        self.idle(10)
+        self.assertEqual([self.take() for _ in range(3)], [0, 0, 0])
+        self.assertGreater(self.take(), 0)
+
+
+class LocalBucketStoreTests(BucketStoreTests, SimpleTestCase):
+    store = LocalBucketStore(10)
+
+
+class SharedBucketStoreTests(BucketStoreTests, SimpleTestCase):
+    store = SharedBucketStore('shared')
+
+    def idle(self, seconds):
+        # Срок ключа в кэше идёт по настоящим часам: истекаем его вручную.
+        super().idle(seconds)
+        caches['shared'].delete(self.store.key_prefix + 'scope:user:1')
+
+    def test_concurrent_workers_share_limit(self):
+        results = []
+        get = LocMemCache.get
+
+        def slow_get(*args, **kwargs):
+            # Расширяет окно между чтением и записью, как сетевой кэш.
+            value = get(*args, **kwargs)
+            time.sleep(0.001)
+            return value
+
+        def worker():
+            for _ in range(10):
+                results.append(self.take())
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        with mock.patch.object(LocMemCache, 'get', slow_get):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(results.count(0), 3)
+        self.now += 1.0
+        self.assertEqual(self.take(), 0)
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    'DEFAULT_THROTTLE_RATES': {'ingredient_search': '2/min'}})
+class ThrottleResponseTests(TestCase):
+
+    def setUp(self):
+        throttle_store.clear()
+        caches['default'].clear()
+        self.addCleanup(throttle_store.clear)
+
+    def test_retry_after_on_429(self):
+        client = APIClient()
+        statuses = [client.get('/api/ingredients/', {'name': 'с'}).status_code
+                    for _ in range(2)]
+        self.assertEqual(statuses, [200, 200])
+        response = client.get('/api/ingredients/', {'name': 'с'})
+        self.assertEqual(response.status_code, 429)
+        self.assertIn(int(response['Retry-After']), (29, 30))
+        self.assertEqual(
+            client.get('/api/ingredients/').status_code, 200)
@@ -0,0 +1,51 @@
+from django.test import TestCase
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api.serializers import UserSerializer
+from api.tests.utils import create_user
+from users.models import Subscriptions
+
+
+class UserListTests(TestCase):
+
+    def setUp(self):
+        self.reader = create_user('reader')
+        self.authors = [create_user(f'author{n}') for n in range(10)]
+        self.followed = set(author.pk for author in self.authors[:4])
+        Subscriptions.objects.bulk_create(
+            Subscriptions(user=self.reader, author_id=pk)
+            for pk in self.followed)
+        self.follower = create_user('follower')
+        Subscriptions.objects.create(user=self.follower, author=self.reader)
+        self.client = APIClient()
+        self.client.force_authenticate(self.reader)
+
+    def test_list_queries_do_not_grow_with_page_size(self):
+        for limit in (1, 5, 20):
+            with self.assertNumQueries(2):
+                response = self.client.get('/api/users/', {'limit': limit})
+            self.assertEqual(len(response.data['results']), limit
+                             if limit < 12 else 12)
+
+    def test_detail_queries(self):
+        with self.assertNumQueries(1):
+            self.client.get(f'/api/users/{self.authors[0].pk}/')
+
+    def test_is_subscribed_means_reader_follows_user(self):
+        response = self.client.get('/api/users/', {'limit': 20})
+        subscribed = {row['id'] for row in response.data['results']
+                      if row['is_subscribed']}
+        self.assertEqual(subscribed, self.followed)
+        self.assertFalse(self.client.get(
+            f'/api/users/{self.follower.pk}/').data['is_subscribed'])
+        self.assertTrue(self.client.get(
+            f'/api/users/{self.authors[0].pk}/').data['is_subscribed'])
+
+    def test_serializer_fallback_uses_follower_relation(self):
+        request = APIRequestFactory().get('/api/users/')
+        request.user = self.reader
+        context = {'request': request}
+        self.assertTrue(UserSerializer(
+            self.authors[0], context=context).data['is_subscribed'])
+        self.assertFalse(UserSerializer(
+            self.follower, context=context).data['is_subscribed'])
@@ -0,0 +1,23 @@
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from recipe.models import Recipe
+from users.models import User
+
+
+def create_user(name):
+    return User.objects.create_user(
+        username=name, email=f'{name}@example.com', password=None,
+        first_name=name.title(), last_name=name.title())
+
+
+def auth_client(user):
+    client = APIClient()
+    token, _ = Token.objects.get_or_create(user=user)
+    client.credentials(HTTP_AUTHORIZATION=f'Token {token.key}')
+    return client
+
+
+def create_recipe(author, name='Рецепт'):
+    return Recipe.objects.create(author=author, name=name, text='Текст',
+                                 cooking_time=10, image='recipes/test.png')
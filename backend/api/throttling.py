@@ -0,0 +1,137 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 60 * 60 * 24}
+
+
+class LocalBucketStore:
+    clock = staticmethod(time.monotonic)
+
+    def __init__(self, size):
+        self.size = size
+        self._tats = {}
+
+    def take(self, key, interval, burst):
+        now = self.clock()
+        tat = max(self._tats.get(key, now), now)
+        wait = tat - now - burst
+        if wait > 0:
+            return wait
+        self._tats[key] = tat + interval
+        if len(self._tats) > self.size:
+            self.sweep(now)
+        return 0
+
+    def sweep(self, now):
+        for key, tat in list(self._tats.items()):
+            if tat <= now:
+                self._tats.pop(key, None)
+        for key in list(self._tats)[:len(self._tats) - self.size]:
+            self._tats.pop(key, None)
+
+    def clear(self):
+        self._tats.clear()
+
+
+# TAT хранится в миллисекундах: запрос резервирует интервал атомарным
+# incr и возвращает его через decr при отказе, а ключ живёт, пока TAT в
+# будущем, и после простоя создаётся заново через add. incr/add атомарны
+# в Memcached и LocMem, но не в DatabaseCache. Срок ключа считается в
+# целых секундах, поэтому сразу после простоя корзина может выдать
+# сверх нормы столько запросов, сколько интервалов укладывается в секунду.
+class SharedBucketStore:
+    clock = staticmethod(time.time)
+    key_prefix = 'throttle:'
+    attempts = 3
+
+    def __init__(self, alias):
+        self.alias = alias
+
+    @staticmethod
+    def ttl(milliseconds):
+        return max(1, math.ceil(milliseconds / 1000))
+
+    def take(self, key, interval, burst):
+        cache = caches[self.alias]
+        key = self.key_prefix + key
+        step = math.ceil(interval * 1000)
+        for _ in range(self.attempts):
+            now = int(self.clock() * 1000)
+            if cache.add(key, now + step, self.ttl(step)):
+                return 0
+            try:
+                tat = cache.incr(key, step)
+            except ValueError:
+                continue
+            wait = tat - step - now - burst * 1000
+            if wait > 0:
+                cache.decr(key, step)
+                return wait / 1000
+            cache.touch(key, self.ttl(tat - now))
+            return 0
+        return 0
+
+    def clear(self):
+        caches[self.alias].clear()
+
+
+throttle_store = (SharedBucketStore(settings.THROTTLE_CACHE_ALIAS)
+                  if settings.THROTTLE_CACHE_ALIAS
+                  else LocalBucketStore(settings.THROTTLE_STORE_SIZE))
+
+
+def parse_rate(rate):
+    if rate is None:
+        return None
+    num, period = rate.split('/')
+    num = int(num)
+    interval = DURATIONS[period[0]] / num
+    return interval, interval * (num - 1)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    scope = None
+
+    def __init__(self):
+        self.retry_after = None
+        self.rate = parse_rate(
+            api_settings.DEFAULT_THROTTLE_RATES.get(self.scope))
+
+    def get_key(self, request):
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+        return f'{self.scope}:{ident}'
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        self.retry_after = throttle_store.take(self.get_key(request),
+                                               *self.rate)
+        return not self.retry_after
+
+    def wait(self):
+        return self.retry_after
+
+
+class DownloadThrottle(TokenBucketThrottle):
+    scope = 'download_shopping_cart'
+
+
+class RecipeCreateThrottle(TokenBucketThrottle):
+    scope = 'recipe_create'
+
+
+class IngredientSearchThrottle(TokenBucketThrottle):
+    scope = 'ingredient_search'
+
+    def allow_request(self, request, view):
+        if not request.query_params.get('name'):
+            return True
+        return super().allow_request(request, view)
@@ -1,7 +1,8 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import IngredientViewSet, RecipeViewSet, TagViewSet, UserViewSet
+from .views import (EventTicketViewSet, IngredientViewSet, MetricsViewSet,
+                    RecipeViewSet, SyncViewSet, TagViewSet, UserViewSet)
 
 app_name = 'api'
 
@@ -10,6 +11,9 @@ router.register('tags', TagViewSet, 'tags')
 router.register('ingredients', IngredientViewSet, 'ingredients')
 router.register('recipes', RecipeViewSet, 'recipes')
 router.register('users', UserViewSet, 'users')
+router.register('sync', SyncViewSet, 'sync')
+router.register('events/tickets', EventTicketViewSet, 'event-tickets')
+router.register('metrics', MetricsViewSet, 'metrics')
 
 urlpatterns = (
     path('', include(router.urls)),
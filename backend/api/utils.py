@@ -1,9 +1,11 @@
 import csv
 from datetime import datetime as dt
 
+from django.db import transaction
 from django.http.response import HttpResponse
 
-from recipe.models import IngredientAmount
+from api.changes import record_links
+from recipe.models import ChangeLog, IngredientAmount
 
 
 def recipe_amount_ingredients_set(recipe, ingredients):
@@ -15,6 +17,44 @@ def recipe_amount_ingredients_set(recipe, ingredients):
         )
 
 
+def bulk_add(model, user, field, targets, ids):
+    ids = list(dict.fromkeys(ids))
+    found = set(targets.filter(pk__in=ids).values_list('pk', flat=True))
+    existing = set(model.objects.filter(
+        user=user, **{f'{field}__in': found}
+    ).values_list(f'{field}_id', flat=True))
+    created = [pk for pk in ids if pk in found and pk not in existing]
+    with transaction.atomic():
+        model.objects.bulk_create(
+            [model(user=user, **{f'{field}_id': pk}) for pk in created],
+            ignore_conflicts=True
+        )
+        record_links(model, ChangeLog.UPSERT, created, user)
+    return [
+        {'id': pk,
+         'status': ('not_found' if pk not in found
+                    else 'exists' if pk in existing
+                    else 'created')}
+        for pk in ids
+    ]
+
+
+def bulk_remove(model, user, field, ids):
+    ids = list(dict.fromkeys(ids))
+    links = model.objects.filter(user=user, **{f'{field}__in': ids})
+    with transaction.atomic():
+        deleted = set(links.values_list(f'{field}_id', flat=True))
+        links.delete()
+        record_links(model, ChangeLog.DELETE, deleted, user)
+    return [{'id': pk, 'status': 'deleted' if pk in deleted else 'not_found'}
+            for pk in ids]
+
+
+def format_amount(amount):
+    amount = round(amount, 2)
+    return int(amount) if amount == int(amount) else amount
+
+
 def prepare_file(user, ingredients, filename='shopping_list.txt'):
     create_time = dt.now().strftime('%d.%m.%Y %H:%M')
 
@@ -30,7 +70,7 @@ def prepare_file(user, ingredients, filename='shopping_list.txt'):
         writer.writerow(
             [
                 ingredient['ingredient'],
-                ingredient['sum_amount'],
+                format_amount(ingredient['sum_amount']),
                 ingredient['measure']
             ]
         )
@@ -1,57 +1,136 @@
-from django.db.models import F, Sum
+from django.db import IntegrityError, transaction
+from django.conf import settings
+from django.db.models import Exists, F, FloatField, OuterRef, Sum
+from django.http import Http404
 from djoser.views import UserViewSet as DjoserUserViewSet
 from rest_framework.decorators import action
-from rest_framework.generics import get_object_or_404
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.status import (HTTP_401_UNAUTHORIZED,
                                    HTTP_201_CREATED, HTTP_200_OK,
                                    HTTP_204_NO_CONTENT)
-from rest_framework.viewsets import ModelViewSet, ReadOnlyModelViewSet
+from rest_framework.viewsets import (ModelViewSet, ReadOnlyModelViewSet,
+                                     ViewSet)
 
+from api.authentication import token_cache
+from api.catalog import bump_catalog_version, catalog_response
+from api.events import issue_ticket
+from api.changes import collect_changes, record_links
+from api.facets import links_catalog, tag_facets
+from api.feed import fan_out, get_feed, invalidate_feeds
 from api.filters import IngredientFilter, RecipeFilter
+from api.guards import snapshot
 from api.paginators import PageLimitPagination
+from api.pantry import pantry_index
 from api.permissions import AuthorOrAdminOrReadOnly
-from api.serializers import (IngredientSerializer, TagSerializer,
+from api.purge import purge_recipes
+from api.recommendations import similarity_index
+from api.renderers import FastJSONRenderer
+from api.sampling import random_index
+from api.serializers import (BulkIdsSerializer,
+                             IngredientSerializer, TagSerializer,
                              ShoppingCartSerializer,
                              FavoriteSerializer, UserSerializer,
                              RecipeSerializer, GetRecipeSerializer,
                              SubscribeSerializer,
                              FollowSerializer)
-from api.utils import prepare_file
-from recipe.models import (Ingredient, IngredientAmount, Recipe,
+from api.throttling import (DownloadThrottle, IngredientSearchThrottle,
+                            RecipeCreateThrottle)
+from api.utils import bulk_add, bulk_remove, prepare_file
+from recipe.models import (ChangeLog, Ingredient, IngredientAmount, Recipe,
                            Tag, Favorites, Carts)
 from users.models import User, Subscriptions
 
 
+def link_pk(pk):
+    try:
+        return int(pk)
+    except ValueError:
+        raise Http404
+
+
+def create_link(serializers, target_model, user, field, pk):
+    pk = link_pk(pk)
+    try:
+        with transaction.atomic():
+            if not target_model.objects.select_for_update(
+                no_key=True
+            ).filter(pk=pk).exists():
+                raise Http404
+            link = serializers.Meta.model.objects.create(
+                user=user, **{f'{field}_id': pk}
+            )
+            record_links(serializers.Meta.model, ChangeLog.UPSERT, [pk],
+                         user)
+            return link
+    except IntegrityError:
+        raise ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: [serializers.unique_message]}
+        )
+
+
+def delete_link(model, user, field, pk):
+    pk = link_pk(pk)
+    with transaction.atomic():
+        deleted, _ = model.objects.filter(
+            user=user, **{f'{field}_id': pk}
+        ).delete()
+        if not deleted:
+            raise Http404
+        record_links(model, ChangeLog.DELETE, [pk], user)
+
+
+def bulk_toggle(request, model, field, targets):
+    serializer = BulkIdsSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+    ids = serializer.validated_data['ids']
+    if request.method == 'POST':
+        return Response(bulk_add(model, request.user, field, targets, ids),
+                        status=HTTP_200_OK)
+    return Response(bulk_remove(model, request.user, field, ids),
+                    status=HTTP_200_OK)
+
+
 class UserViewSet(DjoserUserViewSet):
     pagination_class = PageLimitPagination
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if (self.action in ('list', 'retrieve')
+                and self.request.user.is_authenticated):
+            queryset = queryset.annotate(is_subscribed=Exists(
+                Subscriptions.objects.filter(author=OuterRef('pk'),
+                                             user=self.request.user)))
+        return queryset
+
     @action(methods=('POST', 'DELETE'), detail=True)
     def subscribe(self, request, id):
-        user = request.user
-        author = get_object_or_404(User, pk=id)
-        data = {
-            'user': user.id,
-            'author': author.id,
-        }
         if request.method == 'POST':
-            serializer = FollowSerializer(
-                data=data,
-                context={'request': request}
-            )
-            serializer.is_valid(raise_exception=True)
-            serializer.save()
+            follow = create_link(FollowSerializer, User,
+                                 request.user, 'author', id)
+            invalidate_feeds([request.user.pk])
             return Response(
-                serializer.data,
+                FollowSerializer(
+                    follow,
+                    context={'request': request}
+                ).data,
                 status=HTTP_201_CREATED
             )
-        get_object_or_404(
-            Subscriptions,
-            user=request.user,
-            author=author
-        ).delete()
+        delete_link(Subscriptions, request.user, 'author', id)
+        invalidate_feeds([request.user.pk])
         return Response(status=HTTP_204_NO_CONTENT)
 
+    @action(methods=('POST', 'DELETE'), detail=False,
+            url_path='subscribe/bulk')
+    def subscribe_bulk(self, request):
+        response = bulk_toggle(request, Subscriptions, 'author',
+                               User.objects.exclude(pk=request.user.pk))
+        invalidate_feeds([request.user.pk])
+        return response
+
     @action(methods=('GET',), detail=False)
     def subscriptions(self, request):
         return self.get_paginated_response(
@@ -74,19 +153,43 @@ class UserViewSet(DjoserUserViewSet):
         )
 
 
-class TagViewSet(ReadOnlyModelViewSet):
+class CatalogViewSet(ReadOnlyModelViewSet):
+    catalog_name = None
+
+    def list(self, request, *args, **kwargs):
+        if (request.query_params
+                or not isinstance(request.accepted_renderer,
+                                  FastJSONRenderer)):
+            return super().list(request, *args, **kwargs)
+        return catalog_response(
+            request,
+            self.catalog_name,
+            lambda: request.accepted_renderer.render(
+                self.get_serializer(self.get_queryset(), many=True).data
+            )
+        )
+
+
+class TagViewSet(CatalogViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     permission_classes = (AuthorOrAdminOrReadOnly,)
     pagination_class = None
+    catalog_name = 'tags'
 
 
-class IngredientViewSet(ReadOnlyModelViewSet):
+class IngredientViewSet(CatalogViewSet):
     queryset = Ingredient.objects.all()
     serializer_class = IngredientSerializer
     permission_classes = (AuthorOrAdminOrReadOnly,)
     pagination_class = None
     filterset_class = IngredientFilter
+    throttle_classes = (IngredientSearchThrottle,)
+    catalog_name = 'ingredients'
+
+
+def split_param(value):
+    return {name.strip() for name in value.split(',') if name.strip()}
 
 
 class RecipeViewSet(ModelViewSet):
@@ -95,42 +198,179 @@ class RecipeViewSet(ModelViewSet):
     pagination_class = PageLimitPagination
     filterset_class = RecipeFilter
 
+    def get_recipe_fields(self):
+        params = self.request.query_params
+        available = set(GetRecipeSerializer.Meta.fields)
+        if 'fields' in params:
+            selected = split_param(params['fields']) | {'id'}
+            if 'compact' in selected:
+                selected |= set(GetRecipeSerializer.Meta.compact_fields)
+        else:
+            selected = available
+        return (selected | split_param(params.get('expand', ''))) & available
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+        fields = self.get_recipe_fields()
+        if 'text' not in fields:
+            queryset = queryset.defer('text')
+        if 'tags' in fields:
+            queryset = queryset.prefetch_related('tags')
+        if 'ingredients' in fields:
+            queryset = queryset.prefetch_related('ingredient_recipe')
+        user = self.request.user
+        for name, model in (('is_favorited', Favorites),
+                            ('is_in_shopping_cart', Carts)):
+            if user.is_authenticated and name in fields:
+                queryset = queryset.annotate(**{name: Exists(
+                    model.objects.filter(user=user, recipe=OuterRef('pk'))
+                )})
+        return queryset
+
+    def facets_queryset(self):
+        params = self.request.query_params.copy()
+        params.pop('tags', None)
+        return self.filterset_class(params, queryset=Recipe.objects.all(),
+                                    request=self.request).qs
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        if 'tags' in split_param(request.query_params.get('facets', '')):
+            response.data['facets'] = {
+                'tags': tag_facets(request, self.facets_queryset)
+            }
+        return response
+
+    def get_throttles(self):
+        if self.action == 'create':
+            return [RecipeCreateThrottle()]
+        return super().get_throttles()
+
     def get_serializer_class(self):
         if self.request.method == 'GET':
             return GetRecipeSerializer
         return RecipeSerializer
 
-    @staticmethod
-    def create_object(serializers, user, recipe):
-        data = {
-            'user': user.id,
-            'recipe': recipe.id,
-        }
-        serializer = serializers(
-            data=data,
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.method == 'GET':
+            context['fields'] = self.get_recipe_fields()
+        return context
+
+    @transaction.atomic
+    def perform_create(self, serializer):
+        recipe = serializer.save()
+        pantry_index.update(recipe.pk)
+        transaction.on_commit(lambda: fan_out(recipe))
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        pantry_index.update(serializer.save().pk)
+
+    def perform_destroy(self, instance):
+        purge_recipes([instance.pk])
+
+    def ordered_response(self, ids):
+        recipes = self.get_queryset().in_bulk(ids)
+        return Response(
+            GetRecipeSerializer(
+                [recipes[pk] for pk in ids if pk in recipes],
+                many=True,
+                context=self.get_serializer_context()
+            ).data
+        )
+
+    def get_limit(self):
+        try:
+            limit = int(self.request.query_params.get(
+                'limit', settings.RECOMMENDATIONS_LIMIT))
+        except ValueError:
+            limit = settings.RECOMMENDATIONS_LIMIT
+        return max(1, min(limit, settings.RECOMMENDATIONS_TOP_K))
+
+    @action(methods=('GET',), detail=False,
+            permission_classes=(IsAuthenticated,))
+    def feed(self, request):
+        try:
+            cursor = request.query_params.get('cursor')
+            cursor = None if cursor is None else int(cursor)
+            limit = int(request.query_params.get(
+                'limit', settings.REST_FRAMEWORK['PAGE_SIZE']))
+        except ValueError:
+            raise ValidationError({'cursor': 'Некорректное значение'})
+        ids, next_cursor = get_feed(
+            request.user, cursor,
+            max(1, min(limit, settings.FEED_MAX_PAGE_SIZE)))
+        recipes = self.get_queryset().in_bulk(ids)
+        return Response({
+            'next': None if next_cursor is None else replace_query_param(
+                request.build_absolute_uri(), 'cursor', next_cursor),
+            'results': GetRecipeSerializer(
+                [recipes[pk] for pk in ids if pk in recipes],
+                many=True,
+                context=self.get_serializer_context()
+            ).data
+        })
+
+    @action(methods=('GET',), detail=False)
+    def random(self, request):
+        try:
+            n = int(request.query_params.get(
+                'n', settings.RANDOM_RECIPES_DEFAULT))
+        except ValueError:
+            raise ValidationError({'n': 'Ожидается целое число.'})
+        return self.ordered_response(random_index.sample(
+            max(1, min(n, settings.RANDOM_RECIPES_MAX)),
+            request.query_params.getlist('tags')))
+
+    @action(methods=('GET',), detail=True)
+    def similar(self, request, pk):
+        recipe = self.get_object()
+        return self.ordered_response(
+            similarity_index.similar(recipe.pk, self.get_limit())
+        )
+
+    @action(methods=('GET',), detail=False,
+            permission_classes=(IsAuthenticated,))
+    def recommended(self, request):
+        seeds = Favorites.objects.filter(user=request.user).values_list(
+            'recipe_id', flat=True
+        ).union(Carts.objects.filter(user=request.user).values_list(
+            'recipe_id', flat=True
+        ))
+        return self.ordered_response(
+            similarity_index.recommended(list(seeds), self.get_limit())
         )
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
+
+    @staticmethod
+    def create_object(serializers, user, pk):
+        link = create_link(serializers, Recipe, user, 'recipe', pk)
+        bump_catalog_version(links_catalog(user.pk))
         return Response(
-            serializer.data,
+            serializers(link).data,
             status=HTTP_201_CREATED
         )
 
     @staticmethod
     def delete_object(request, pk, model):
-        get_object_or_404(
-            model,
-            user=request.user,
-            recipe=get_object_or_404(Recipe, id=pk)
-        ).delete()
+        delete_link(model, request.user, 'recipe', pk)
+        bump_catalog_version(links_catalog(request.user.pk))
         return Response(status=HTTP_204_NO_CONTENT)
 
+    @staticmethod
+    def bulk_object(request, model):
+        response = bulk_toggle(request, model, 'recipe', Recipe.objects)
+        bump_catalog_version(links_catalog(request.user.pk))
+        return response
+
     @action(methods=('POST',), detail=True)
     def favorite(self, request, pk):
         return self.create_object(
             FavoriteSerializer,
             request.user,
-            get_object_or_404(Recipe, id=pk)
+            pk
         )
 
     @favorite.mapping.delete
@@ -141,12 +381,17 @@ class RecipeViewSet(ModelViewSet):
             model=Favorites
         )
 
+    @action(methods=('POST', 'DELETE'), detail=False,
+            url_path='favorite/bulk')
+    def favorite_bulk(self, request):
+        return self.bulk_object(request, Favorites)
+
     @action(methods=('POST',), detail=True)
     def shopping_cart(self, request, pk):
         return self.create_object(
             ShoppingCartSerializer,
             request.user,
-            get_object_or_404(Recipe, id=pk)
+            pk
         )
 
     @shopping_cart.mapping.delete
@@ -157,12 +402,49 @@ class RecipeViewSet(ModelViewSet):
             model=Carts
         )
 
-    @action(methods=('GET',), detail=False)
+    @action(methods=('POST', 'DELETE'), detail=False,
+            url_path='shopping_cart/bulk')
+    def shopping_cart_bulk(self, request):
+        return self.bulk_object(request, Carts)
+
+    @action(methods=('GET',), detail=False,
+            throttle_classes=(DownloadThrottle,))
     def download_shopping_cart(self, request):
         user = self.request.user
         ingredients = IngredientAmount.objects.filter(
-            recipe__shopping_cart__user=user).values(
-            ingredient=F('ingredients__name'),
-            measure=F('ingredients__measurement_unit')).order_by(
-            'ingredient').annotate(sum_amount=Sum('amount'))
+            recipe_id__in=Carts.objects.filter(user=user).values(
+                'recipe_id')).values(
+            ingredient=F('canonical_name'),
+            measure=F('base_unit')).order_by(
+            'ingredient', 'measure').annotate(sum_amount=Sum(
+                F('amount') * F('unit_factor'),
+                output_field=FloatField()))
         return prepare_file(user, ingredients)
+
+
+class SyncViewSet(ViewSet):
+
+    def list(self, request):
+        since = request.query_params.get('since')
+        try:
+            since = None if since is None else int(since)
+        except ValueError:
+            raise ValidationError({'since': 'Ожидается целое число.'})
+        return Response(collect_changes(since, request.user))
+
+
+class EventTicketViewSet(ViewSet):
+    permission_classes = (IsAuthenticated,)
+
+    def create(self, request):
+        return Response({'ticket': issue_ticket(request.user),
+                         'expires_in': settings.EVENTS_TICKET_TTL},
+                        status=HTTP_201_CREATED)
+
+
+class MetricsViewSet(ViewSet):
+    permission_classes = (IsAdminUser,)
+
+    def list(self, request):
+        return Response({'guards': snapshot(),
+                         'token_cache': token_cache.stats()})
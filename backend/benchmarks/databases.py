@@ -0,0 +1,144 @@
+"""SQLite (WAL) против PostgreSQL на смешанной нагрузке:
+python -m benchmarks.databases [--engines sqlite sqlite-wal postgres]."""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+ENGINES = {
+    'sqlite': {'SQLITE_ENGINE': 'django.db.backends.sqlite3'},
+    'sqlite-wal': {'SQLITE_ENGINE': 'foodgram.sqlite'},
+    'postgres': {'TEST_BASE': 'False'},
+}
+
+MIX = (('list', 50), ('detail', 25), ('toggle', 20), ('download', 5))
+
+
+def request(client, recipes, action):
+    if action == 'list':
+        return [client.get('/api/recipes/',
+                           {'page': random.randint(1, 20)})]
+    if action == 'detail':
+        return [client.get(f'/api/recipes/{random.choice(recipes)}/')]
+    if action == 'download':
+        return [client.get('/api/recipes/download_shopping_cart/')]
+    url = (f'/api/recipes/{random.choice(recipes)}/'
+           f'{random.choice(("favorite", "shopping_cart"))}/')
+    return [client.post(url), client.delete(url)]
+
+
+def worker(tokens, recipes, duration, seed):
+    from django.db import connections
+    from rest_framework.test import APIClient
+
+    connections.close_all()
+    random.seed(seed)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f'Token {random.choice(tokens)}')
+    actions, weights = zip(*MIX)
+    latencies, errors = [], 0
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        action = random.choices(actions, weights)[0]
+        started = time.perf_counter()
+        try:
+            responses = request(client, recipes, action)
+            errors += sum(response.status_code >= 500
+                          for response in responses)
+        except Exception:
+            errors += 1
+        latencies.append(time.perf_counter() - started)
+    connections.close_all()
+    return latencies, errors
+
+
+def run_engine(args):
+    import django
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+    from rest_framework.authtoken.models import Token
+
+    from benchmarks.db import test_database
+    from recipe.models import Recipe
+    from users.models import User
+
+    if connection.vendor == 'sqlite':
+        call_command('migrate', verbosity=0)
+        context = None
+    else:
+        context = test_database()
+        context.__enter__()
+    try:
+        call_command('seed_load', users=args.users, recipes=args.recipes,
+                     seed=1, verbosity=0, stdout=open(os.devnull, 'w'))
+        tokens = [Token.objects.get_or_create(user=user)[0].key
+                  for user in User.objects.all()[:args.processes * 10]]
+        recipes = list(Recipe.objects.values_list('pk', flat=True))
+        connection.close()
+        with ProcessPoolExecutor(args.processes) as executor:
+            results = list(executor.map(
+                worker, [tokens] * args.processes,
+                [recipes] * args.processes,
+                [args.duration] * args.processes,
+                range(args.processes)))
+    finally:
+        if context is not None:
+            context.__exit__(None, None, None)
+    latencies = np.concatenate([np.array(result[0]) for result in results])
+    print(json.dumps({
+        'requests': len(latencies),
+        'rps': len(latencies) / args.duration,
+        'p50': float(np.percentile(latencies, 50) * 1000),
+        'p95': float(np.percentile(latencies, 95) * 1000),
+        'p99': float(np.percentile(latencies, 99) * 1000),
+        'errors': sum(result[1] for result in results),
+    }))
+
+
+def main(args):
+    for engine in args.engines:
+        with tempfile.TemporaryDirectory() as directory:
+            env = dict(os.environ, **ENGINES[engine],
+                       DJANGO_SETTINGS_MODULE='foodgram.settings',
+                       SQLITE_NAME=os.path.join(directory, 'bench.sqlite3'),
+                       THROTTLE_DOWNLOAD_RATE='1000000/s',
+                       BENCH_ENGINE=engine)
+            result = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.databases',
+                 *sys.argv[1:]],
+                cwd=BASE_DIR, env=env, capture_output=True, text=True)
+        if result.returncode:
+            print(f'{engine}: пропущен\n    '
+                  f'{result.stderr.strip().splitlines()[-1]}')
+            continue
+        stats = json.loads(result.stdout.strip().splitlines()[-1])
+        print(f'{engine}: {stats["requests"]} запросов, '
+              f'{stats["rps"]:.0f} rps, p50 {stats["p50"]:.1f} мс, '
+              f'p95 {stats["p95"]:.1f} мс, p99 {stats["p99"]:.1f} мс, '
+              f'ошибок {stats["errors"]}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--engines', nargs='+', choices=ENGINES,
+                        default=list(ENGINES))
+    parser.add_argument('--processes', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--recipes', type=int, default=2000)
+    arguments = parser.parse_args()
+    if os.getenv('BENCH_ENGINE'):
+        run_engine(arguments)
+    else:
+        main(arguments)
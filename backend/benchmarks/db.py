@@ -0,0 +1,19 @@
+import contextlib
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from django.db import connection  # noqa: E402
+
+
+@contextlib.contextmanager
+def test_database():
+    name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(name, verbosity=0)
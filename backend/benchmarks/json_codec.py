@@ -0,0 +1,92 @@
+"""Пропускная способность JSON: python -m benchmarks.json_codec."""
+import argparse
+import base64
+import io
+import os
+import timeit
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.parsers import FastJSONParser  # noqa: E402
+from api.renderers import FastJSONRenderer  # noqa: E402
+
+
+def recipe(pk, ingredients):
+    return {
+        'id': pk,
+        'author': {'id': pk % 97, 'email': f'cook{pk}@foodgram.ru',
+                   'username': f'cook{pk}', 'first_name': 'Иван',
+                   'last_name': 'Петров', 'is_subscribed': pk % 3 == 0},
+        'name': f'Рецепт номер {pk}',
+        'image': f'http://foodgram.ru/media/recipe_images/{pk}.jpg',
+        'text': 'Нарезать, смешать и запекать до готовности. ' * 20,
+        'ingredients': [{'id': i, 'name': f'Ингредиент {i}',
+                         'measurement_unit': 'г', 'amount': 100 + i}
+                        for i in range(ingredients)],
+        'tags': [{'id': 1, 'name': 'Завтрак', 'color': '#E26C2D',
+                  'slug': 'breakfast'}],
+        'cooking_time': 45,
+        'is_favorited': pk % 2 == 0,
+        'is_in_shopping_cart': False,
+    }
+
+
+def page(size, ingredients):
+    return {'count': 100000, 'next': 'http://foodgram.ru/api/recipes/?page=2',
+            'previous': None,
+            'results': [recipe(pk, ingredients) for pk in range(size)]}
+
+
+def create_payload(image_kb):
+    image = base64.b64encode(os.urandom(image_kb * 1024)).decode()
+    payload = recipe(1, 10)
+    payload.update(image=f'data:image/jpeg;base64,{image}',
+                   ingredients=[{'id': i, 'amount': 10} for i in range(10)],
+                   tags=[1, 2])
+    return payload
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f'    {label:<14} {seconds * 1e6:10.1f} мкс  '
+          f'{1 / seconds:10.0f} оп/с')
+    return seconds
+
+
+def compare(title, data, number):
+    print(title)
+    rendered = JSONRenderer().render(data)
+    print(f'    {"размер":<14} {len(rendered) / 1024:10.1f} КБ')
+    render = {
+        label: measure(f'render {label}', lambda: renderer.render(data),
+                       number)
+        for label, renderer in (('stdlib', JSONRenderer()),
+                                ('fast', FastJSONRenderer()))
+    }
+    parse = {
+        label: measure(f'parse {label}',
+                       lambda: parser.parse(io.BytesIO(rendered)), number)
+        for label, parser in (('stdlib', JSONParser()),
+                              ('fast', FastJSONParser()))
+    }
+    print(f'    ускорение: render x{render["stdlib"] / render["fast"]:.1f}, '
+          f'parse x{parse["stdlib"] / parse["fast"]:.1f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--page-size', type=int, default=50)
+    parser.add_argument('--ingredients', type=int, default=12)
+    parser.add_argument('--image-kb', type=int, default=512)
+    parser.add_argument('--number', type=int, default=200)
+    args = parser.parse_args()
+    compare(f'Страница рецептов ({args.page_size} шт.)',
+            page(args.page_size, args.ingredients), args.number)
+    compare(f'Создание рецепта (изображение {args.image_kb} КБ)',
+            create_payload(args.image_kb), args.number)
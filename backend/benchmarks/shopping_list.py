@@ -0,0 +1,104 @@
+"""Проекция ингредиентов против JOIN: python -m benchmarks.shopping_list."""
+import argparse
+import csv
+import random
+import timeit
+
+from benchmarks.db import test_database
+from django.conf import settings
+from django.db.models import F, FloatField, Sum
+
+from recipe.models import Carts, Ingredient, IngredientAmount, Recipe
+from users.models import User
+
+
+def populate(recipes, per_recipe, cart):
+    with open(settings.BASE_DIR / 'data' / 'ingredients.csv',
+              encoding='utf-8') as file:
+        Ingredient.objects.bulk_create(
+            Ingredient(name=name, measurement_unit=unit).normalize()
+            for name, unit in csv.reader(file))
+    catalog = list(Ingredient.objects.all())
+    user = User.objects.create(email='bench@foodgram.ru', username='bench')
+    Recipe.objects.bulk_create(
+        Recipe(author=user, name=f'Рецепт {pk}', text='-', cooking_time=10,
+               image='recipe_images/bench.png')
+        for pk in range(recipes))
+    recipe_ids = list(Recipe.objects.values_list('pk', flat=True))
+    IngredientAmount.objects.bulk_create(
+        (IngredientAmount(recipe_id=pk, ingredients=ingredient,
+                          amount=random.randint(1, 500)).copy_ingredient()
+         for pk in recipe_ids
+         for ingredient in random.sample(catalog, per_recipe)),
+        batch_size=5000)
+    Carts.objects.bulk_create(
+        Carts(user=user, recipe_id=pk)
+        for pk in random.sample(recipe_ids, cart))
+    return user
+
+
+def join_aggregate(user):
+    return list(IngredientAmount.objects.filter(
+        recipe__shopping_cart__user=user).values(
+        ingredient=F('ingredients__canonical_name'),
+        measure=F('ingredients__base_unit')).order_by(
+        'ingredient', 'measure').annotate(sum_amount=Sum(
+            F('amount') * F('ingredients__unit_factor'),
+            output_field=FloatField())))
+
+
+def projection_aggregate(user):
+    return list(IngredientAmount.objects.filter(
+        recipe_id__in=Carts.objects.filter(user=user).values(
+            'recipe_id')).values(
+        ingredient=F('canonical_name'),
+        measure=F('base_unit')).order_by(
+        'ingredient', 'measure').annotate(sum_amount=Sum(
+            F('amount') * F('unit_factor'), output_field=FloatField())))
+
+
+def join_rows(user):
+    return [(row.ingredients_id, row.ingredients.name,
+             row.ingredients.measurement_unit, row.amount)
+            for row in IngredientAmount.objects.filter(
+                recipe__shopping_cart__user=user).select_related(
+                'ingredients')]
+
+
+def projection_rows(user):
+    return [(row.ingredients_id, row.name, row.measurement_unit, row.amount)
+            for row in IngredientAmount.objects.filter(
+                recipe__shopping_cart__user=user)]
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f'    {label:<12} {seconds * 1000:8.2f} мс')
+    return seconds
+
+
+def main(args):
+    with test_database():
+        user = populate(args.recipes, args.per_recipe, args.cart)
+        rows = projection_aggregate(user)
+        assert len(rows) > 1 and rows == join_aggregate(user)
+        print(f'Строк в сводном списке: {len(rows)}')
+        for title, join, projection in (
+                ('Сводный список покупок', join_aggregate,
+                 projection_aggregate),
+                ('Строки ингредиентов рецептов', join_rows,
+                 projection_rows)):
+            print(f'{title} (корзина {args.cart} рецептов)')
+            before = measure('join', lambda: join(user), args.number)
+            after = measure('projection', lambda: projection(user),
+                            args.number)
+            print(f'    ускорение x{before / after:.2f}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--recipes', type=int, default=20000)
+    parser.add_argument('--per-recipe', type=int, default=10)
+    parser.add_argument('--cart', type=int, default=2000)
+    parser.add_argument('--number', type=int, default=5)
+    main(parser.parse_args())
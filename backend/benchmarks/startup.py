@@ -0,0 +1,57 @@
+"""Профиль холодного старта: python -m benchmarks.startup [--top N]."""
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+ENTRY_POINTS = {
+    'setup': 'import django; django.setup()',
+    'load_tags': ('import django; django.setup(); '
+                  'from django.core.management import load_command_class; '
+                  "load_command_class('api', 'load_tags')"),
+    'wsgi': ('from foodgram.wsgi import application; '
+             'from django.urls import get_resolver; '
+             'get_resolver().url_patterns'),
+}
+
+RSS_PROBE = ('; import resource; import sys; '
+             'sys.stdout.write(str(resource.getrusage('
+             'resource.RUSAGE_SELF).ru_maxrss))')
+
+
+def run(code, api_only):
+    env = dict(os.environ,
+               DJANGO_SETTINGS_MODULE='foodgram.settings',
+               API_ONLY=str(api_only))
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code + RSS_PROBE],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True, check=True)
+    modules = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        modules.append((int(cumulative_us), int(self_us), name.rstrip()))
+    return modules, int(result.stdout or 0)
+
+
+def report(top):
+    for entry, code in ENTRY_POINTS.items():
+        for api_only in (False, True):
+            modules, rss = run(code, api_only)
+            total = sum(self_us for _, self_us, _ in modules)
+            print(f'{entry} API_ONLY={api_only}: '
+                  f'{len(modules)} модулей, {total / 1000:.1f} мс, '
+                  f'maxrss {rss / 1024:.1f} МБ')
+            for cumulative_us, _, name in sorted(modules,
+                                                 reverse=True)[:top]:
+                print(f'    {cumulative_us / 1000:8.1f} мс {name}')
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--top', type=int, default=10)
+    report(parser.parse_args().top)
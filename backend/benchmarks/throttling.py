@@ -0,0 +1,51 @@
+"""Накладные расходы троттлинга: python -m benchmarks.throttling."""
+import argparse
+import os
+import timeit
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+django.setup()
+
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from api.throttling import (LocalBucketStore,  # noqa: E402
+                            SharedBucketStore, TokenBucketThrottle)
+
+
+class BenchThrottle(TokenBucketThrottle):
+    scope = 'ingredient_search'
+
+
+def measure(label, func, number):
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f'    {label:<28} {seconds * 1e6:8.2f} мкс')
+
+
+def main(args):
+    interval, burst = 1 / 1e9, 1e9
+    stores = (('в процессе', LocalBucketStore(args.clients)),
+              ('общий кэш (default)', SharedBucketStore('default')))
+    print(f'Вызов take() для {args.clients} клиентов')
+    for label, store in stores:
+        keys = iter(range(10 ** 9))
+        measure(label, lambda: store.take(
+            f'bench:{next(keys) % args.clients}', interval, burst),
+            args.number)
+    request = APIRequestFactory().get('/api/ingredients/', {'name': 'с'})
+    request = Request(request)
+    request.user = AnonymousUser()
+    throttle = BenchThrottle()
+    print('Проверка allow_request() целиком')
+    measure('TokenBucketThrottle', lambda: throttle.allow_request(
+        request, None), args.number)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=10000)
+    parser.add_argument('--number', type=int, default=100000)
+    main(parser.parse_args())
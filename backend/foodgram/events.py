@@ -0,0 +1,9 @@
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'foodgram.settings')
+
+django.setup()
+
+from api.events import events_application as application  # noqa: E402,F401
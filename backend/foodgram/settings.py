@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,8 +15,10 @@ DEBUG = os.getenv('DEBUG', default=False)
 
 ALLOWED_HOSTS = os.getenv('ALLOWED_HOSTS', default='*').split(',')
 
+API_ONLY = os.getenv('API_ONLY', default='False') == 'True'
+
 INSTALLED_APPS = [
-    'django.contrib.admin',
+    'django.contrib.admin.apps.SimpleAdminConfig',
     'django.contrib.auth',
     'django.contrib.contenttypes',
     'django.contrib.sessions',
@@ -33,12 +36,14 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'api.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.StatementTimeoutMiddleware',
 ]
 
 ROOT_URLCONF = 'foodgram.urls'
@@ -59,13 +64,44 @@ TEMPLATES = [
     },
 ]
 
+ADMIN_ONLY_APPS = (
+    'django.contrib.admin.apps.SimpleAdminConfig',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+)
+
+ADMIN_ONLY_MIDDLEWARE = (
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+)
+
+if API_ONLY:
+    INSTALLED_APPS = [app for app in INSTALLED_APPS
+                      if app not in ADMIN_ONLY_APPS]
+    MIDDLEWARE = [middleware for middleware in MIDDLEWARE
+                  if middleware not in ADMIN_ONLY_MIDDLEWARE]
+    TEMPLATES[0]['OPTIONS']['context_processors'].remove(
+        'django.contrib.messages.context_processors.messages')
+
 WSGI_APPLICATION = 'foodgram.wsgi.application'
 
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'cache_size': -64000,
+    'mmap_size': 256 * 1024 * 1024,
+    'busy_timeout': 5000,
+    'temp_store': 'MEMORY',
+}
+
 if os.getenv('TEST_BASE', default=True) is True:
     DATABASES = {
         'default': {
-            'ENGINE': 'django.db.backends.sqlite3',
-            'NAME': BASE_DIR / 'db.sqlite3'
+            'ENGINE': os.getenv('SQLITE_ENGINE', default='foodgram.sqlite'),
+            'NAME': os.getenv('SQLITE_NAME', default=BASE_DIR / 'db.sqlite3')
         }
     }
 else:
@@ -82,6 +118,28 @@ else:
         }
     }
 
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv(
+            'CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', default=''),
+    },
+    'shared': {
+        'BACKEND': os.getenv(
+            'SHARED_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('SHARED_CACHE_LOCATION', default='shared'),
+    },
+}
+
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', default=1))
+if (WEB_CONCURRENCY > 1
+        and CACHES['shared']['BACKEND'].endswith('.LocMemCache')):
+    raise ImproperlyConfigured(
+        'WEB_CONCURRENCY > 1: задайте SHARED_CACHE_BACKEND и '
+        'SHARED_CACHE_LOCATION общего кэша (Memcached).')
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': ('django.contrib.auth.password_validation.'
@@ -126,7 +184,16 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticatedOrReadOnly',
     ],
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'api.authentication.CachedTokenAuthentication',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
     'DEFAULT_PAGINATION_CLASS': ('rest_framework.pagination.'
                                  'PageNumberPagination'),
@@ -134,8 +201,67 @@ REST_FRAMEWORK = {
     'DEFAULT_FILTER_BACKENDS': [
         'django_filters.rest_framework.DjangoFilterBackend'
     ],
+    'DEFAULT_THROTTLE_RATES': {
+        'download_shopping_cart': os.getenv('THROTTLE_DOWNLOAD_RATE',
+                                            default='10/min'),
+        'recipe_create': os.getenv('THROTTLE_RECIPE_CREATE_RATE',
+                                   default='20/min'),
+        'ingredient_search': os.getenv('THROTTLE_INGREDIENT_SEARCH_RATE',
+                                       default='120/min'),
+    },
 }
 
+THROTTLE_CACHE_ALIAS = os.getenv('THROTTLE_CACHE_ALIAS', default=None)
+THROTTLE_STORE_SIZE = 100000
+
+TOKEN_CACHE_TTL = int(os.getenv('TOKEN_CACHE_TTL', default=60))
+TOKEN_CACHE_ALIAS = os.getenv('TOKEN_CACHE_ALIAS', default=None)
+
+RECOMMENDATIONS_INDEX = os.getenv(
+    'RECOMMENDATIONS_INDEX',
+    default=os.path.join(BASE_DIR, 'recommendations.npz'))
+RECOMMENDATIONS_TOP_K = 20
+RECOMMENDATIONS_LIMIT = 10
+RECOMMENDATIONS_INGREDIENT_WEIGHT = 0.3
+RECOMMENDATIONS_BLOCK_CELLS = 2 ** 24
+
+PANTRY_INDEX_TTL = int(os.getenv('PANTRY_INDEX_TTL', default=300))
+PANTRY_INDEX_MAX_CHANGES = 1000
+PANTRY_MAX_MISSING = 0
+PANTRY_MAX_RESULTS = 500
+
+COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', default=1024))
+CATALOG_CACHE_TTL = int(os.getenv('CATALOG_CACHE_TTL', default=300))
+
+POPULARITY_HALF_LIFE_DAYS = 30
+TRENDING_HALF_LIFE_DAYS = 2
+POPULARITY_FAVORITE_WEIGHT = 1.0
+POPULARITY_CART_WEIGHT = 0.5
+POPULARITY_BATCH_SIZE = 10000
+
+RANDOM_RECIPES_DEFAULT = 6
+RANDOM_RECIPES_MAX = 50
+RANDOM_INDEX_REFRESH = int(os.getenv('RANDOM_INDEX_REFRESH', default=10))
+
+PURGE_BATCH_SIZE = 500
+PURGE_QUEUE_THRESHOLD = int(os.getenv('PURGE_QUEUE_THRESHOLD', default=1000))
+PURGE_POLL_INTERVAL = 5
+
+SYNC_MAX_CHANGES = 1000
+SYNC_SETTLE_SECONDS = 2
+SYNC_RETENTION_DAYS = int(os.getenv('SYNC_RETENTION_DAYS', default=30))
+
+EVENTS_PATH = '/api/events/'
+EVENTS_TICKET_TTL = 30
+EVENTS_QUEUE_SIZE = 100
+EVENTS_POLL_INTERVAL = 1.0
+EVENTS_HEARTBEAT = 15
+
+FEED_FANOUT_LIMIT = int(os.getenv('FEED_FANOUT_LIMIT', default=1000))
+FEED_LENGTH = 500
+FEED_TTL = 60 * 60 * 24
+FEED_MAX_PAGE_SIZE = 50
+
 CSRF_TRUSTED_ORIGINS = os.getenv(
     'CSRF_TO',
     default='http://localhost;http://127.0.0.1', ).strip().split(sep=';')
@@ -159,3 +285,12 @@ DJOSER = {
 USER_EMAIL_FIELD_LENG = 254
 USER_CHAR_FIELD_LENG = 150
 RECIPE_CHAR_FIELD_LENG = 200
+BULK_MAX_IDS = 100
+MAX_PAGE_SIZE = 100
+MAX_FILTER_VALUES = 20
+STATEMENT_TIMEOUT = int(os.getenv('STATEMENT_TIMEOUT', default=3000))
+STATEMENT_TIMEOUTS = {
+    'recipes-list': 2000,
+    'users-list': 2000,
+    'recipes-download-shopping-cart': 10000,
+}
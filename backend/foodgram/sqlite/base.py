@@ -0,0 +1,95 @@
+import re
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.backends.sqlite3 import base
+
+WRITE_QUERY = re.compile(r'\s*(INSERT|UPDATE|DELETE|REPLACE)\b', re.I)
+
+writer_lock = threading.RLock()
+
+
+def acquire_writer():
+    timeout = settings.SQLITE_PRAGMAS.get('busy_timeout', 5000) / 1000
+    if not writer_lock.acquire(timeout=timeout):
+        raise OperationalError('database is locked')
+
+
+class WriterCursorWrapper(base.SQLiteCursorWrapper):
+    def execute(self, query, params=None):
+        with self.db.writing(WRITE_QUERY.match(query)):
+            return super().execute(query, params)
+
+    def executemany(self, query, param_list):
+        with self.db.writing(True):
+            return super().executemany(query, param_list)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.holds_writer = False
+        self.begin_pending = False
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def create_cursor(self, name=None):
+        cursor = self.connection.cursor(factory=WriterCursorWrapper)
+        cursor.db = self
+        return cursor
+
+    def _start_transaction_under_autocommit(self):
+        # BEGIN откладывается до первого запроса: если он пишет, транзакция
+        # открывается как IMMEDIATE под блокировкой писателя, иначе как
+        # обычная отложенная и блокировку не берёт.
+        self.begin_pending = True
+
+    @contextmanager
+    def writing(self, write):
+        begin, self.begin_pending = self.begin_pending, False
+        in_transaction = begin or self.connection.in_transaction
+        release = False
+        if write and not self.holds_writer:
+            acquire_writer()
+            self.holds_writer = True
+            release = not in_transaction
+        try:
+            if begin:
+                self.connection.execute(
+                    'BEGIN IMMEDIATE' if write else 'BEGIN')
+            yield
+        finally:
+            if release:
+                self.release_writer()
+
+    def release_writer(self):
+        if self.holds_writer:
+            self.holds_writer = False
+            writer_lock.release()
+
+    def _commit(self):
+        self.begin_pending = False
+        try:
+            return super()._commit()
+        finally:
+            self.release_writer()
+
+    def _rollback(self):
+        self.begin_pending = False
+        try:
+            return super()._rollback()
+        finally:
+            self.release_writer()
+
+    def _close(self):
+        self.begin_pending = False
+        try:
+            return super()._close()
+        finally:
+            self.release_writer()
@@ -1,6 +1,7 @@
 from django.contrib.admin import ModelAdmin, TabularInline, register
 from django.utils.safestring import mark_safe
 
+from api.purge import deletion_perms_needed, schedule_recipes
 from .forms import TagForm
 from .models import Ingredient, IngredientAmount, Recipe, Tag
 
@@ -39,6 +40,18 @@ class RecipeAdmin(ModelAdmin):
     empty_value_display = EMPTY_PLACEHOLDER
     inlines = (IngredientInline,)
 
+    def get_deleted_objects(self, objs, request):
+        return ([str(obj) for obj in objs],
+                {self.model._meta.verbose_name_plural: len(objs)},
+                deletion_perms_needed(self.admin_site, self.model, request),
+                [])
+
+    def delete_model(self, request, obj):
+        schedule_recipes([obj.pk])
+
+    def delete_queryset(self, request, queryset):
+        schedule_recipes(list(queryset.values_list('pk', flat=True)))
+
     def get_image(self, obj):
         return mark_safe(f'<img src={obj.image.url} width="80" height="35"')
 
@@ -0,0 +1,36 @@
+# Generated by Django 3.2.13 on 2026-10-19 00:56
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_ingredients(apps, schema_editor):
+    Ingredient = apps.get_model('recipe', 'Ingredient')
+    IngredientAmount = apps.get_model('recipe', 'IngredientAmount')
+    ingredient = Ingredient.objects.filter(pk=OuterRef('ingredients_id'))
+    IngredientAmount.objects.update(
+        name=Subquery(ingredient.values('name')[:1]),
+        measurement_unit=Subquery(
+            ingredient.values('measurement_unit')[:1]),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredientamount',
+            name='measurement_unit',
+            field=models.CharField(default='', editable=False, max_length=200, verbose_name='Единицы измерения'),
+        ),
+        migrations.AddField(
+            model_name='ingredientamount',
+            name='name',
+            field=models.CharField(default='', editable=False, max_length=200, verbose_name='Название ингредиента'),
+        ),
+        migrations.RunPython(copy_ingredients, migrations.RunPython.noop),
+    ]
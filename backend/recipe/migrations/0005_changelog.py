@@ -0,0 +1,32 @@
+# Generated by Django 3.2.13 on 2026-10-19 01:08
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('recipe', '0004_timestamps_popularity'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('seq', models.BigAutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('recipe', 'Рецепт'), ('tag', 'Тег'), ('ingredient', 'Ингредиент'), ('favorite', 'Избранное'), ('cart', 'Список покупок'), ('subscription', 'Подписка')], max_length=16, verbose_name='Тип объекта')),
+                ('action', models.CharField(choices=[('upsert', 'Изменение'), ('delete', 'Удаление')], max_length=8, verbose_name='Действие')),
+                ('object_id', models.PositiveIntegerField(verbose_name='ID объекта')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True, verbose_name='Дата изменения')),
+                ('user', models.ForeignKey(db_constraint=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Пользователь')),
+            ],
+            options={
+                'verbose_name': 'Изменение',
+                'verbose_name_plural': 'Журнал изменений',
+                'ordering': ('seq',),
+            },
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 3.2.13 on 2026-10-19 01:11
+
+import re
+
+from django.db import migrations, models
+
+# Словари на момент миграции: recipe.units может меняться, а миграция
+# должна давать тот же результат. Новые значения применяет команда
+# normalize_ingredients.
+UNITS = {
+    'г': ('г', 1),
+    'кг': ('г', 1000),
+    'мл': ('мл', 1),
+    'л': ('мл', 1000),
+    'ч. л.': ('мл', 5),
+    'ст. л.': ('мл', 15),
+    'стакан': ('мл', 250),
+}
+
+CANONICAL_NAMES = {
+    'разрыхлитель': 'пекарский порошок',
+    'разрыхлитель теста': 'пекарский порошок',
+    'перец черный свежемолотый': 'перец черный молотый',
+    'томаты': 'помидоры',
+}
+
+
+def canonical_name(name):
+    name = re.sub(r'\s+', ' ', name.lower().replace('ё', 'е')).strip(' .,')
+    return CANONICAL_NAMES.get(name, name)
+
+
+def base_unit(unit):
+    unit = re.sub(r'\s+', ' ', unit).strip()
+    return UNITS.get(unit.lower(), (unit, 1))
+
+
+def normalize(apps, schema_editor):
+    Ingredient = apps.get_model('recipe', 'Ingredient')
+    rows = list(Ingredient.objects.values_list(
+        'pk', 'name', 'measurement_unit'))
+    Ingredient.objects.bulk_update(
+        [Ingredient(pk=pk, canonical_name=canonical_name(name),
+                    base_unit=base_unit(unit)[0],
+                    unit_factor=base_unit(unit)[1])
+         for pk, name, unit in rows],
+        ('canonical_name', 'base_unit', 'unit_factor'), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0005_changelog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredient',
+            name='base_unit',
+            field=models.CharField(default='', editable=False, max_length=200, verbose_name='Базовая единица измерения'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='canonical_name',
+            field=models.CharField(default='', editable=False, max_length=200, verbose_name='Нормализованное название'),
+        ),
+        migrations.AddField(
+            model_name='ingredient',
+            name='unit_factor',
+            field=models.FloatField(default=1, editable=False, verbose_name='Множитель к базовой единице'),
+        ),
+        migrations.RunPython(normalize, migrations.RunPython.noop),
+    ]
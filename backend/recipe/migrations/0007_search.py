@@ -0,0 +1,107 @@
+from django.db import migrations
+
+POSTGRES_SQL = (
+    'ALTER TABLE recipe_recipe ADD COLUMN IF NOT EXISTS search_vector '
+    'tsvector',
+    """
+    CREATE OR REPLACE FUNCTION recipe_recipe_search_vector_update()
+    RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('russian', coalesce(NEW.name, '')), 'A')
+            || setweight(to_tsvector('russian', coalesce(NEW.text, '')),
+                         'B');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    'DROP TRIGGER IF EXISTS recipe_recipe_search_vector ON recipe_recipe',
+    """
+    CREATE TRIGGER recipe_recipe_search_vector
+    BEFORE INSERT OR UPDATE OF name, text ON recipe_recipe
+    FOR EACH ROW EXECUTE PROCEDURE recipe_recipe_search_vector_update()
+    """,
+    'CREATE INDEX IF NOT EXISTS recipe_recipe_search_vector_gin '
+    'ON recipe_recipe USING gin(search_vector)',
+    'UPDATE recipe_recipe SET name = name WHERE search_vector IS NULL',
+)
+POSTGRES_REVERSE_SQL = (
+    'DROP INDEX IF EXISTS recipe_recipe_search_vector_gin',
+    'DROP TRIGGER IF EXISTS recipe_recipe_search_vector ON recipe_recipe',
+    'DROP FUNCTION IF EXISTS recipe_recipe_search_vector_update()',
+    'ALTER TABLE recipe_recipe DROP COLUMN IF EXISTS search_vector',
+)
+
+# SQLite пересоздаёт таблицу при изменении её полей и теряет триггеры:
+# миграции, меняющие recipe_recipe, должны выполнить SQLITE_TRIGGERS заново.
+SQLITE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_recipe_fts_insert
+    AFTER INSERT ON recipe_recipe BEGIN
+        INSERT INTO recipe_recipe_fts(rowid, name, text)
+        VALUES (new.id, new.name, new.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_recipe_fts_delete
+    AFTER DELETE ON recipe_recipe BEGIN
+        INSERT INTO recipe_recipe_fts(recipe_recipe_fts, rowid, name, text)
+        VALUES ('delete', old.id, old.name, old.text);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS recipe_recipe_fts_update
+    AFTER UPDATE OF name, text ON recipe_recipe BEGIN
+        INSERT INTO recipe_recipe_fts(recipe_recipe_fts, rowid, name, text)
+        VALUES ('delete', old.id, old.name, old.text);
+        INSERT INTO recipe_recipe_fts(rowid, name, text)
+        VALUES (new.id, new.name, new.text);
+    END
+    """,
+)
+SQLITE_SQL = (
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS recipe_recipe_fts USING fts5(
+        name, text, content='recipe_recipe', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    *SQLITE_TRIGGERS,
+    "INSERT INTO recipe_recipe_fts(recipe_recipe_fts) VALUES ('rebuild')",
+)
+SQLITE_REVERSE_SQL = (
+    'DROP TRIGGER IF EXISTS recipe_recipe_fts_insert',
+    'DROP TRIGGER IF EXISTS recipe_recipe_fts_delete',
+    'DROP TRIGGER IF EXISTS recipe_recipe_fts_update',
+    'DROP TABLE IF EXISTS recipe_recipe_fts',
+)
+
+
+class VendorRunSQL(migrations.RunSQL):
+    def __init__(self, vendor, *args, **kwargs):
+        self.vendor = vendor
+        super().__init__(*args, **kwargs)
+
+    def database_forwards(self, app_label, schema_editor, from_state,
+                          to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_forwards(app_label, schema_editor, from_state,
+                                      to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state,
+                           to_state):
+        if schema_editor.connection.vendor == self.vendor:
+            super().database_backwards(app_label, schema_editor, from_state,
+                                       to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0006_ingredient_units'),
+    ]
+
+    operations = [
+        VendorRunSQL('postgresql', POSTGRES_SQL, POSTGRES_REVERSE_SQL),
+        VendorRunSQL('sqlite', SQLITE_SQL, SQLITE_REVERSE_SQL),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.13 on 2026-10-19 01:44
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def copy_units(apps, schema_editor):
+    Ingredient = apps.get_model('recipe', 'Ingredient')
+    IngredientAmount = apps.get_model('recipe', 'IngredientAmount')
+    ingredient = Ingredient.objects.filter(pk=OuterRef('ingredients_id'))
+    IngredientAmount.objects.update(**{
+        field: Subquery(ingredient.values(field)[:1])
+        for field in ('canonical_name', 'base_unit', 'unit_factor')})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0007_search'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ingredientamount',
+            name='base_unit',
+            field=models.CharField(default='', editable=False, max_length=200, verbose_name='Базовая единица измерения'),
+        ),
+        migrations.AddField(
+            model_name='ingredientamount',
+            name='canonical_name',
+            field=models.CharField(default='', editable=False, max_length=200, verbose_name='Нормализованное название'),
+        ),
+        migrations.AddField(
+            model_name='ingredientamount',
+            name='unit_factor',
+            field=models.FloatField(default=1, editable=False, verbose_name='Множитель к базовой единице'),
+        ),
+        migrations.RunPython(copy_units, migrations.RunPython.noop),
+    ]
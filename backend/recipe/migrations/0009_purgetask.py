@@ -0,0 +1,31 @@
+# Generated by Django 3.2.13 on 2026-10-19 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipe', '0008_ingredientamount_units'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurgeTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('recipe', 'Рецепт'), ('user', 'Пользователь')], max_length=8, verbose_name='Тип объекта')),
+                ('object_id', models.PositiveIntegerField(verbose_name='ID объекта')),
+                ('created', models.DateTimeField(auto_now_add=True, verbose_name='Дата постановки')),
+            ],
+            options={
+                'verbose_name': 'Удаление в очереди',
+                'verbose_name_plural': 'Очередь удаления',
+                'ordering': ('pk',),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='purgetask',
+            constraint=models.UniqueConstraint(fields=('kind', 'object_id'), name='Unique_purge_task'),
+        ),
+    ]
@@ -1,10 +1,12 @@
 from django.conf import settings
 from django.core.validators import MinValueValidator, RegexValidator
-from django.db.models import (CASCADE, CharField, ForeignKey,
-                              ImageField, ManyToManyField, Model,
-                              SlugField, TextField,
+from django.db.models import (CASCADE, DO_NOTHING, BigAutoField, CharField,
+                              DateTimeField, FloatField, ForeignKey,
+                              ImageField, Index, ManyToManyField, Model,
+                              PositiveIntegerField, SlugField, TextField,
                               UniqueConstraint, PositiveSmallIntegerField)
 
+from recipe.units import base_unit, canonical_name
 from users.models import User
 
 
@@ -13,6 +15,17 @@ class Ingredient(Model):
                                  max_length=settings.RECIPE_CHAR_FIELD_LENG, )
     name = CharField(verbose_name='Ингредиент',
                      max_length=settings.RECIPE_CHAR_FIELD_LENG, )
+    canonical_name = CharField(verbose_name='Нормализованное название',
+                               max_length=settings.RECIPE_CHAR_FIELD_LENG,
+                               default='',
+                               editable=False, )
+    base_unit = CharField(verbose_name='Базовая единица измерения',
+                          max_length=settings.RECIPE_CHAR_FIELD_LENG,
+                          default='',
+                          editable=False, )
+    unit_factor = FloatField(verbose_name='Множитель к базовой единице',
+                             default=1,
+                             editable=False, )
 
     class Meta:
         verbose_name = 'Ингредиент'
@@ -26,8 +39,20 @@ class Ingredient(Model):
     def __str__(self):
         return f'{self.name}, {self.measurement_unit}'
 
+    def normalize(self):
+        self.canonical_name = canonical_name(self.name)
+        self.base_unit, self.unit_factor = base_unit(self.measurement_unit)
+        return self
+
+    def save(self, *args, **kwargs):
+        self.normalize()
+        super().save(*args, **kwargs)
+
 
 class IngredientAmount(Model):
+    COPIED_FIELDS = ('name', 'measurement_unit',
+                     'canonical_name', 'base_unit', 'unit_factor')
+
     amount = PositiveSmallIntegerField(
         verbose_name='Количество',
         validators=(MinValueValidator(1, 'Не может быть меньше 1.'),), )
@@ -40,6 +65,25 @@ class IngredientAmount(Model):
                         on_delete=CASCADE,
                         related_name='ingredient_recipe',
                         verbose_name='Рецепты, содержащие ингредиенты', )
+    name = CharField(verbose_name='Название ингредиента',
+                     max_length=settings.RECIPE_CHAR_FIELD_LENG,
+                     default='',
+                     editable=False, )
+    measurement_unit = CharField(verbose_name='Единицы измерения',
+                                 max_length=settings.RECIPE_CHAR_FIELD_LENG,
+                                 default='',
+                                 editable=False, )
+    canonical_name = CharField(verbose_name='Нормализованное название',
+                               max_length=settings.RECIPE_CHAR_FIELD_LENG,
+                               default='',
+                               editable=False, )
+    base_unit = CharField(verbose_name='Базовая единица измерения',
+                          max_length=settings.RECIPE_CHAR_FIELD_LENG,
+                          default='',
+                          editable=False, )
+    unit_factor = FloatField(verbose_name='Множитель к базовой единице',
+                             default=1,
+                             editable=False, )
 
     class Meta:
         verbose_name = 'Ингредиент'
@@ -53,6 +97,16 @@ class IngredientAmount(Model):
     def __str__(self):
         return f'{self.recipe}: {self.amount}, {self.ingredients}'
 
+    def copy_ingredient(self, ingredient=None):
+        ingredient = ingredient or self.ingredients
+        for field in self.COPIED_FIELDS:
+            setattr(self, field, getattr(ingredient, field))
+        return self
+
+    def save(self, *args, **kwargs):
+        self.copy_ingredient()
+        super().save(*args, **kwargs)
+
 
 class Tag(Model):
     color = CharField(
@@ -99,12 +153,30 @@ class Recipe(Model):
                            related_name='recipes',
                            verbose_name='Теги')
     text = TextField(verbose_name='Описание рецепта', )
+    pub_date = DateTimeField(verbose_name='Дата публикации',
+                             auto_now_add=True,
+                             db_index=True, )
+    updated = DateTimeField(verbose_name='Дата изменения',
+                            auto_now=True, )
+    popularity = FloatField(verbose_name='Популярность',
+                            default=0,
+                            editable=False, )
+    trending = FloatField(verbose_name='Набирает популярность',
+                          default=0,
+                          editable=False, )
 
     class Meta:
         verbose_name = 'Рецепт'
         verbose_name_plural = 'Рецепты'
+        ordering = ('-pub_date', '-id')
         constraints = (UniqueConstraint(name='unique_per_author',
                                         fields=('name', 'author')),)
+        indexes = (
+            Index(name='recipe_popularity_idx',
+                  fields=('-popularity', '-id')),
+            Index(name='recipe_trending_idx',
+                  fields=('-trending', '-id')),
+        )
 
     def __str__(self):
         return self.name
@@ -121,6 +193,10 @@ class RecipeBase(Model):
         on_delete=CASCADE,
         verbose_name='Рецепт'
     )
+    created = DateTimeField(
+        verbose_name='Дата добавления',
+        auto_now_add=True
+    )
 
     class Meta:
         abstract = True
@@ -153,3 +229,68 @@ class Carts(RecipeBase):
         ]
         verbose_name = 'Список покупок'
         verbose_name_plural = 'Списки покупок'
+
+
+class ChangeLog(Model):
+    UPSERT = 'upsert'
+    DELETE = 'delete'
+    ACTIONS = ((UPSERT, 'Изменение'), (DELETE, 'Удаление'))
+    KINDS = (
+        ('recipe', 'Рецепт'),
+        ('tag', 'Тег'),
+        ('ingredient', 'Ингредиент'),
+        ('favorite', 'Избранное'),
+        ('cart', 'Список покупок'),
+        ('subscription', 'Подписка'),
+    )
+
+    seq = BigAutoField(primary_key=True)
+    kind = CharField(verbose_name='Тип объекта',
+                     max_length=16,
+                     choices=KINDS, )
+    action = CharField(verbose_name='Действие',
+                       max_length=8,
+                       choices=ACTIONS, )
+    object_id = PositiveIntegerField(verbose_name='ID объекта')
+    user = ForeignKey(User,
+                      on_delete=DO_NOTHING,
+                      db_constraint=False,
+                      null=True,
+                      related_name='+',
+                      verbose_name='Пользователь', )
+    created = DateTimeField(verbose_name='Дата изменения',
+                            auto_now_add=True,
+                            db_index=True, )
+
+    class Meta:
+        verbose_name = 'Изменение'
+        verbose_name_plural = 'Журнал изменений'
+        ordering = ('seq',)
+
+    def __str__(self):
+        return f'{self.seq}: {self.action} {self.kind} {self.object_id}'
+
+
+class PurgeTask(Model):
+    RECIPE = 'recipe'
+    USER = 'user'
+    KINDS = ((RECIPE, 'Рецепт'), (USER, 'Пользователь'))
+
+    kind = CharField(verbose_name='Тип объекта',
+                     max_length=8,
+                     choices=KINDS, )
+    object_id = PositiveIntegerField(verbose_name='ID объекта')
+    created = DateTimeField(verbose_name='Дата постановки',
+                            auto_now_add=True, )
+
+    class Meta:
+        verbose_name = 'Удаление в очереди'
+        verbose_name_plural = 'Очередь удаления'
+        ordering = ('pk',)
+        constraints = (
+            UniqueConstraint(name='Unique_purge_task',
+                             fields=('kind', 'object_id')),
+        )
+
+    def __str__(self):
+        return f'{self.kind} {self.object_id}'
@@ -0,0 +1,30 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+
+
+def search_recipes(queryset, query):
+    words = re.findall(r'\w+', query)
+    if not words:
+        return queryset.none()
+    if connections[queryset.db].vendor == 'postgresql':
+        tsquery = "plainto_tsquery('russian', %s)"
+        return queryset.filter(RawSQL(
+            f'recipe_recipe.search_vector @@ {tsquery}', (query,),
+            output_field=BooleanField(),
+        )).annotate(search_rank=RawSQL(
+            f'ts_rank(recipe_recipe.search_vector, {tsquery})', (query,),
+            output_field=FloatField(),
+        )).order_by('-search_rank', '-pk')
+    match = ' '.join('"{}"*'.format(word) for word in words)
+    return queryset.filter(pk__in=RawSQL(
+        'SELECT rowid FROM recipe_recipe_fts '
+        'WHERE recipe_recipe_fts MATCH %s', (match,),
+    )).annotate(search_rank=RawSQL(
+        '(SELECT -bm25(recipe_recipe_fts, 10.0, 1.0) FROM recipe_recipe_fts '
+        'WHERE recipe_recipe_fts MATCH %s '
+        'AND recipe_recipe_fts.rowid = recipe_recipe.id)', (match,),
+        output_field=FloatField(),
+    )).order_by('-search_rank', '-pk')
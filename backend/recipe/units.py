@@ -0,0 +1,53 @@
+import re
+
+from django.db.models import OuterRef, Subquery
+
+UNITS = {
+    'г': ('г', 1),
+    'кг': ('г', 1000),
+    'мл': ('мл', 1),
+    'л': ('мл', 1000),
+    'ч. л.': ('мл', 5),
+    'ст. л.': ('мл', 15),
+    'стакан': ('мл', 250),
+}
+
+CANONICAL_NAMES = {
+    'разрыхлитель': 'пекарский порошок',
+    'разрыхлитель теста': 'пекарский порошок',
+    'перец черный свежемолотый': 'перец черный молотый',
+    'томаты': 'помидоры',
+}
+
+
+def canonical_name(name):
+    name = re.sub(r'\s+', ' ', name.lower().replace('ё', 'е')).strip(' .,')
+    return CANONICAL_NAMES.get(name, name)
+
+
+def base_unit(unit):
+    unit = re.sub(r'\s+', ' ', unit).strip()
+    return UNITS.get(unit.lower(), (unit, 1))
+
+
+def normalize_ingredients(model, amount_model, batch_size=1000):
+    rows = list(model.objects.values_list(
+        'pk', 'name', 'measurement_unit',
+        'canonical_name', 'base_unit', 'unit_factor'))
+    names = {name: canonical_name(name) for name in {row[1] for row in rows}}
+    units = {unit: base_unit(unit) for unit in {row[2] for row in rows}}
+    changed = [
+        model(pk=pk, canonical_name=names[name],
+              base_unit=units[unit][0], unit_factor=units[unit][1])
+        for pk, name, unit, *current in rows
+        if tuple(current) != (names[name], *units[unit])
+    ]
+    fields = ('canonical_name', 'base_unit', 'unit_factor')
+    model.objects.bulk_update(changed, fields, batch_size=batch_size)
+    ingredient = model.objects.filter(pk=OuterRef('ingredients_id'))
+    for start in range(0, len(changed), batch_size):
+        amount_model.objects.filter(ingredients_id__in=[
+            row.pk for row in changed[start:start + batch_size]
+        ]).update(**{field: Subquery(ingredient.values(field)[:1])
+                     for field in fields})
+    return len(changed)
@@ -1,6 +1,7 @@
 from django.contrib.admin import register
 from django.contrib.auth.admin import UserAdmin
 
+from api.purge import deletion_perms_needed, schedule_user
 from .models import User
 
 
@@ -44,3 +45,16 @@ class FoodgramUserAdmin(UserAdmin):
     list_filter = ('username', 'first_name', 'email')
     save_on_top = True
     empty_value_display = '-пусто-'
+
+    def get_deleted_objects(self, objs, request):
+        return ([str(obj) for obj in objs],
+                {self.model._meta.verbose_name_plural: len(objs)},
+                deletion_perms_needed(self.admin_site, self.model, request),
+                [])
+
+    def delete_model(self, request, obj):
+        schedule_user(obj.pk)
+
+    def delete_queryset(self, request, queryset):
+        for pk in queryset.values_list('pk', flat=True):
+            schedule_user(pk)